@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image as PILImage, ImageEnhance, ImageOps
+from core.image import PhotonImage
+
+
+SIZE = (4000, 3000)
+REPEATS = 3
+# Contrast on RGB needs the 'L' histogram of the staged image, so each one still costs a pass of its own.
+STACKS = {
+    'brightness/invert': [
+        ('brightness', 1.1), ('brightness', 0.95), ('invert', None), ('brightness', 1.05), ('invert', None),
+        ('brightness', 0.9), ('brightness', 1.2), ('invert', None), ('brightness', 0.85), ('invert', None),
+    ],
+    'with 4 contrast': [
+        ('brightness', 1.1), ('contrast', 1.2), ('brightness', 0.95), ('invert', None), ('contrast', 0.9),
+        ('brightness', 1.05), ('invert', None), ('contrast', 1.1), ('brightness', 0.9), ('contrast', 1.05),
+    ],
+}
+
+
+def sequential(image: PILImage.Image, filters) -> PILImage.Image:
+    for name, param in filters:
+        if name == 'brightness':
+            image = ImageEnhance.Brightness(image).enhance(param)
+        elif name == 'contrast':
+            image = ImageEnhance.Contrast(image).enhance(param)
+        elif name == 'invert':
+            image = ImageOps.invert(image)
+    return image
+
+
+def fused(image: PILImage.Image, filters) -> PILImage.Image:
+    photon_image = PhotonImage(image)
+    photon_image.apply_filters(filters)
+    return photon_image.current
+
+
+def best_time(render, image: PILImage.Image, filters) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        render(image, filters)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    image = PILImage.effect_noise(SIZE, 64).convert('RGB')
+    print(f"10 tonal adjustments on {SIZE[0]}x{SIZE[1]}")
+    print(f"{'stack':>18} {'sequential ms':>14} {'fused ms':>9} {'speedup':>8}")
+    for label, filters in STACKS.items():
+        legacy = best_time(sequential, image, filters)
+        direct = best_time(fused, image, filters)
+        print(f"{label:>18} {legacy * 1000:>14.1f} {direct * 1000:>9.1f} {legacy / direct:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
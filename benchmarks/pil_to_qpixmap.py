@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image as PILImage, ImageQt
+from PySide6.QtGui import QGuiApplication, QPixmap
+from core.qt.convert import pil_to_qpixmap
+
+
+SIZES = {
+    '1 MP': (1280, 800),
+    '12 MP': (4000, 3000),
+    '48 MP': (8000, 6000),
+}
+MODES = ('RGB', 'RGBA', 'L')
+REPEATS = 5
+
+
+def legacy_pil_to_qpixmap(pil_image: PILImage.Image) -> QPixmap:
+    if pil_image.mode == "RGB":
+        r, g, b = pil_image.split()
+        pil_image = PILImage.merge("RGB", (b, g, r))
+    elif pil_image.mode == "RGBA":
+        r, g, b, a = pil_image.split()
+        pil_image = PILImage.merge("RGBA", (b, g, r, a))
+    elif pil_image.mode == "L":
+        pil_image = pil_image.convert("RGB")
+    
+    qim = ImageQt.ImageQt(pil_image)
+    return QPixmap.fromImage(qim)
+
+
+def best_time(convert, image: PILImage.Image) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        convert(image)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    app = QGuiApplication(sys.argv)
+    print(f"{'size':>6} {'mode':>5} {'legacy ms':>10} {'direct ms':>10} {'speedup':>8}")
+    
+    for label, size in SIZES.items():
+        base = PILImage.effect_noise(size, 64).convert('RGB')
+        for mode in MODES:
+            image = base.convert(mode)
+            legacy = best_time(legacy_pil_to_qpixmap, image)
+            direct = best_time(pil_to_qpixmap, image)
+            print(f"{label:>6} {mode:>5} {legacy * 1000:>10.1f} {direct * 1000:>10.1f} {legacy / direct:>7.1f}x")
+    
+    del app
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,11 @@
 import sys
 import os
+
+# Headless batch mode dispatches before app_guard and Qt are imported.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == "batch":
+    from batch import main as batch_main
+    sys.exit(batch_main(sys.argv[2:]))
+
 import app_guard
 
 from pathlib import Path
@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image as PILImage
+from core.image import PhotonImage
+from core.pipeline import PointStage, compile_filters
+from core.tiled import TiledImage, should_stream
+
+
+FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'PNG': '.png',
+    'BMP': '.bmp',
+    'TIFF': '.tif',
+    'WEBP': '.webp',
+    'GIF': '.gif',
+}
+NO_PARAM_OPERATIONS = ('grayscale', 'invert', 'sepia', 'flip_horizontal', 'flip_vertical')
+
+
+def parse_operation(spec: Any) -> Tuple[str, Any]:
+    if isinstance(spec, str):
+        name, args = spec, {}
+    else:
+        args = dict(spec)
+        name = args.pop('op')
+    
+    if name in ('brightness', 'contrast'):
+        return name, float(args['factor'])
+    if name == 'rotate':
+        return name, float(args['degrees'])
+    if name == 'crop':
+        return name, tuple(int(value) for value in args['box'])
+    if name == 'resize':
+        width, height = args['size']
+        return name, ((int(width), int(height)), bool(args.get('keep_aspect', True)))
+    if name in NO_PARAM_OPERATIONS:
+        return name, None
+    raise ValueError(f"Unknown operation: {name}")
+
+
+def load_recipe(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    return {
+        'filters': [parse_operation(spec) for spec in data.get('operations', [])],
+        'format': data.get('format'),
+        'quality': int(data.get('quality', 95)),
+    }
+
+
+def find_images(input_path: Path) -> Iterator[Path]:
+    extensions = {ext for ext, format in PILImage.registered_extensions().items() if format in PILImage.OPEN}
+    if input_path.is_file():
+        yield input_path
+        return
+    
+    for root, dirs, files in os.walk(input_path):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield Path(root) / name
+
+
+def output_path_for(source: Path, input_root: Path, output_root: Path, format: Optional[str]) -> Path:
+    relative = source.relative_to(input_root) if input_root.is_dir() else Path(source.name)
+    if format:
+        relative = relative.with_suffix(FORMAT_EXTENSIONS.get(format.upper(), f".{format.lower()}"))
+    return output_root / relative
+
+
+def process_file(source: str, destination: str, filters: List[Tuple[str, Any]],
+                 format: Optional[str], quality: int) -> Tuple[str, Dict[str, float], Optional[str]]:
+    timings: Dict[str, float] = defaultdict(float)
+    try:
+        if should_stream(source):
+            return process_file_streaming(source, destination, filters, format, quality)
+        
+        start = time.perf_counter()
+        image = PhotonImage.from_file(source)
+        timings['decode'] += time.perf_counter() - start
+        
+        for stage in compile_filters(filters):
+            start = time.perf_counter()
+            image.apply_stage(stage)
+            label = 'point' if isinstance(stage, PointStage) else stage[0]
+            timings[label] += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        save_format = (format or image.format).upper()
+        if save_format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+            image.current = image.current.convert('RGB')
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        image.save(destination, save_format, quality)
+        timings['encode'] += time.perf_counter() - start
+    except Exception as e:
+        return source, dict(timings), str(e)
+    return source, dict(timings), None
+
+
+def process_file_streaming(source: str, destination: str, filters: List[Tuple[str, Any]],
+                           format: Optional[str], quality: int) -> Tuple[str, Dict[str, float], Optional[str]]:
+    timings: Dict[str, float] = defaultdict(float)
+    image = None
+    try:
+        start = time.perf_counter()
+        image = TiledImage.from_file(source)
+        image.apply_filters(filters)
+        timings['decode'] += time.perf_counter() - start
+        
+        # Operations run band by band while the output is written, so rendering and encoding share one stage.
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        image.save(destination, format or image.format, quality)
+        timings['stream'] += time.perf_counter() - start
+    except Exception as e:
+        return source, dict(timings), str(e)
+    finally:
+        if image:
+            image.close()
+    return source, dict(timings), None
+
+
+def run_batch(recipe: Dict[str, Any], input_path: Path, output_path: Path, workers: int) -> int:
+    processed = 0
+    failed = 0
+    stage_totals: Dict[str, float] = defaultdict(float)
+    started = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for source in find_images(input_path):
+            destination = output_path_for(source, input_path, output_path, recipe['format'])
+            pending.add(executor.submit(process_file, str(source), str(destination), recipe['filters'],
+                                        recipe['format'], recipe['quality']))
+            # Bounded in-flight work keeps memory flat on trees with thousands of files.
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed, failed = _collect(done, stage_totals, processed, failed)
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            processed, failed = _collect(done, stage_totals, processed, failed)
+    
+    elapsed = time.perf_counter() - started
+    total = processed + failed
+    print(f"\n{processed} processed, {failed} failed in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:.1f} files/sec, {workers} workers)")
+    
+    if processed:
+        print("Stage timings (summed across workers):")
+        for stage, seconds in sorted(stage_totals.items(), key=lambda item: -item[1]):
+            print(f"  {stage:<16} {seconds:8.2f}s  {seconds / processed * 1000:8.1f} ms/file")
+    
+    return 1 if failed else 0
+
+
+def _collect(done, stage_totals: Dict[str, float], processed: int, failed: int) -> Tuple[int, int]:
+    for future in done:
+        source, timings, error = future.result()
+        if error:
+            failed += 1
+            print(f"Failed: {source}: {error}")
+            continue
+        
+        processed += 1
+        for stage, seconds in timings.items():
+            stage_totals[stage] += seconds
+        print(f"Processed: {source}")
+    return processed, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='photon-snapshot batch',
+                                     description='Apply an edit recipe to every image under a directory.')
+    parser.add_argument('recipe', help='JSON recipe with "operations", and optional "format" and "quality"')
+    parser.add_argument('input', help='Image file or directory to process recursively')
+    parser.add_argument('output', help='Directory the processed images are written to')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: core count)')
+    parser.add_argument('--format', help='Output format, overriding the recipe')
+    parser.add_argument('--quality', type=int, help='Output quality, overriding the recipe')
+    args = parser.parse_args(argv)
+    
+    try:
+        recipe = load_recipe(args.recipe)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Invalid recipe: {e}")
+        return 2
+    
+    if args.format:
+        recipe['format'] = args.format
+    if args.quality is not None:
+        recipe['quality'] = args.quality
+    
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"Input not found: {input_path}")
+        return 2
+    
+    return run_batch(recipe, input_path, Path(args.output), max(1, args.workers))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,14 @@
 from .image import PhotonImage
 from .actions import *
 from .editor import Editor, EditorState
-from .explorer import FileExplorer
-from .overlays import *
 from .utils import *
+import importlib
+
+
+# The Qt adapter layer in core.qt is imported on first use, so importing core never loads PySide6.
+def __getattr__(name: str):
+    if not name.startswith('__'):
+        qt = importlib.import_module('.qt', __name__)
+        if hasattr(qt, name):
+            return getattr(qt, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,147 +1,177 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, List, Optional
 from .image import PhotonImage
+from .pipeline import adjustment_run, with_adjustment_level
+from .recipe import RecipeRenderer
 
 
 class Action(ABC):
+    reversible = False
+    
     def __init__(self, name: str):
         self.name = name
-        self.image_before: Optional[PhotonImage] = None
-        self.image_after: Optional[PhotonImage] = None
+        self.filters_before: List[tuple] = []
+        self.filters_after: List[tuple] = []
+    
+    def execute(self, image: PhotonImage, renderer: Optional[RecipeRenderer] = None) -> PhotonImage:
+        self.filters_before = image.applied_filters.copy()
+        self.apply(image)
+        self.filters_after = image.applied_filters.copy()
+        return image
+    
+    # Undo and redo are edits to the recipe; the renderer serves the bitmap from a checkpoint when it has one.
+    def undo(self, image: PhotonImage, renderer: RecipeRenderer) -> PhotonImage:
+        cached = renderer.lookup(self.filters_before)
+        if cached is not None:
+            image.current = cached
+        elif self.reversible:
+            self.revert(image)
+        else:
+            image.current = renderer.render(self.filters_before)
+        image.applied_filters = self.filters_before.copy()
+        return image
+    
+    def redo(self, image: PhotonImage, renderer: RecipeRenderer) -> PhotonImage:
+        cached = renderer.lookup(self.filters_after)
+        if cached is not None:
+            image.current = cached
+        elif image.applied_filters == self.filters_before:
+            # The image already holds the state this action started from, so only this one step is recomputed.
+            self.apply(image)
+            renderer.store(self.filters_after, image.current)
+        else:
+            image.current = renderer.render(self.filters_after)
+        image.applied_filters = self.filters_after.copy()
+        return image
+    
+    @property
+    def kind(self) -> str:
+        return type(self).__name__[:-len("Action")] or self.name
     
     @abstractmethod
-    def execute(self, image: PhotonImage) -> PhotonImage:
+    def apply(self, image: PhotonImage):
         pass
     
-    @abstractmethod
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        pass
+    def revert(self, image: PhotonImage):
+        raise NotImplementedError(f"{self.name} cannot be reverted without re-rendering")
 
 
 class BrightnessAction(Action):
     def __init__(self, factor: float):
-        super().__init__(f"Brightness {factor}")
+        super().__init__(f"Brightness {factor:.2f}")
         self.factor = factor
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.apply_brightness(self.factor)
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
 
 
 class ContrastAction(Action):
     def __init__(self, factor: float):
-        super().__init__(f"Contrast {factor}")
+        super().__init__(f"Contrast {factor:.2f}")
         self.factor = factor
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.apply_contrast(self.factor)
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
+
+
+class AdjustmentAction(Action):
+    def __init__(self, adjustment: str, level: float):
+        super().__init__(f"{adjustment.capitalize()} {level:.2f}")
+        self.adjustment = adjustment
+        self.level = level
+        self.renderer: Optional[RecipeRenderer] = None
+    
+    @property
+    def kind(self) -> str:
+        return self.adjustment.capitalize()
+    
+    def execute(self, image: PhotonImage, renderer: Optional[RecipeRenderer] = None) -> PhotonImage:
+        self.renderer = renderer
+        try:
+            return super().execute(image)
+        finally:
+            self.renderer = None
+    
+    def redo(self, image: PhotonImage, renderer: RecipeRenderer) -> PhotonImage:
+        self.renderer = renderer
+        try:
+            return super().redo(image, renderer)
+        finally:
+            self.renderer = None
+    
+    # Sliders hold absolute levels: the run of adjustments is re-applied from the state before it with this level
+    # swapped in, instead of stacking another ratio onto pixels that may already have clipped.
+    def apply(self, image: PhotonImage):
+        filters = image.applied_filters
+        start = adjustment_run(filters)
+        run = with_adjustment_level(filters, self.adjustment, self.level)[start:]
+        base = filters[:start]
+        if self.renderer:
+            image.current = self.renderer.render(base)
+            image.applied_filters = list(base)
+        else:
+            image.reset_to_original()
+            image.apply_filters(base)
+        image.apply_filters(run)
 
 
 class GrayscaleAction(Action):
     def __init__(self):
         super().__init__("Grayscale")
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.apply_grayscale()
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
 
 
 class InvertAction(Action):
+    reversible = True
+    
     def __init__(self):
         super().__init__("Invert Colors")
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.apply_invert()
-        self.image_after = image.copy()
-        return image
     
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
+    def revert(self, image: PhotonImage):
+        image.apply_invert()
 
 
 class SepiaAction(Action):
     def __init__(self):
         super().__init__("Sepia")
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.apply_sepia()
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
 
 
 class RotateAction(Action):
     def __init__(self, degrees: float):
         super().__init__(f"Rotate {degrees}°")
         self.degrees = degrees
+        self.reversible = degrees % 90 == 0
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.rotate(self.degrees)
-        self.image_after = image.copy()
-        return image
     
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
+    def revert(self, image: PhotonImage):
+        image.rotate(-self.degrees)
 
 
 class FlipAction(Action):
+    reversible = True
+    
     def __init__(self, direction: str):
         super().__init__(f"Flip {direction}")
         self.direction = direction
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         if self.direction == "horizontal":
             image.flip_horizontal()
         elif self.direction == "vertical":
             image.flip_vertical()
-        self.image_after = image.copy()
-        return image
     
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
+    def revert(self, image: PhotonImage):
+        self.apply(image)
 
 
 class CropAction(Action):
@@ -149,17 +179,8 @@ class CropAction(Action):
         super().__init__("Crop")
         self.box = box
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.crop(self.box)
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
 
 
 class ResizeAction(Action):
@@ -168,14 +189,5 @@ class ResizeAction(Action):
         self.size = size
         self.keep_aspect = keep_aspect
     
-    def execute(self, image: PhotonImage) -> PhotonImage:
-        self.image_before = image.copy()
+    def apply(self, image: PhotonImage):
         image.resize(self.size, self.keep_aspect)
-        self.image_after = image.copy()
-        return image
-    
-    def undo(self, image: PhotonImage) -> PhotonImage:
-        if self.image_before:
-            image.current = self.image_before.current.copy()
-            image.applied_filters = self.image_before.applied_filters.copy()
-        return image
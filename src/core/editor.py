@@ -1,36 +1,81 @@
-from typing import List, Optional, Callable
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Callable, Tuple
+from PIL import Image as PILImage
 from .image import PhotonImage
 from .actions import Action
+from .pipeline import adjustment_level, adjustment_run, with_adjustment_level
+from .recipe import RecipeRenderer
+
+
+class HistoryLatency:
+    def __init__(self, window: int = 50):
+        self.window = window
+        self.samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self.last: Optional[Tuple[str, str, float]] = None
+    
+    def record(self, kind: str, direction: str, seconds: float):
+        key = (kind, direction)
+        if key not in self.samples:
+            self.samples[key] = deque(maxlen=self.window)
+        self.samples[key].append(seconds)
+        self.last = (kind, direction, seconds)
+    
+    def mean(self, kind: str, direction: str) -> Optional[float]:
+        samples = self.samples.get((kind, direction))
+        return sum(samples) / len(samples) if samples else None
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result: Dict[str, Dict[str, float]] = {}
+        for (kind, direction), samples in self.samples.items():
+            stats = result.setdefault(kind, {})
+            stats[f"{direction}_ms"] = sum(samples) / len(samples) * 1000
+            stats[f"{direction}_max_ms"] = max(samples) * 1000
+            stats[f"{direction}_count"] = len(samples)
+        
+        for kind, stats in result.items():
+            if 'undo_ms' in stats and 'redo_ms' in stats:
+                stats['round_trip_ms'] = stats['undo_ms'] + stats['redo_ms']
+        return result
+    
+    def clear(self):
+        self.samples.clear()
+        self.last = None
 
 
 class EditorState:
     def __init__(self):
         self.current_image: Optional[PhotonImage] = None
-        self.history: List[Action] = []
+        self.history: Deque[Action] = deque()
         self.current_index = -1
-        self.max_history_size = 50
+        # History entries are recipes; the pixels they hold are the renderer's checkpoints, in memory or spilled to
+        # scratch, and this one budget covers both.
+        self.max_history_bytes = 2 * 1024 * 1024 * 1024
+        self.max_resident_bytes = 512 * 1024 * 1024
+        self.renderer: Optional[RecipeRenderer] = None
         self.on_state_changed: Optional[Callable] = None
+        self.generation = 0
+        self.latency = HistoryLatency()
     
     def load_image(self, image: PhotonImage):
         self.current_image = image
-        self.history.clear()
-        self.current_index = -1
+        if self.renderer:
+            self.renderer.clear()
+        self.renderer = RecipeRenderer(image.original, self.max_resident_bytes, self.max_history_bytes)
+        self._clear_history()
         self._notify_state_changed()
     
     def execute_action(self, action: Action):
         if not self.current_image:
             return
         
-        if self.current_index < len(self.history) - 1:
-            self.history = self.history[:self.current_index + 1]
+        self._truncate_redo()
         
-        action.execute(self.current_image)
+        action.execute(self.current_image, self.renderer)
+        self.renderer.store(self.current_image.applied_filters, self.current_image.current)
         self.history.append(action)
         self.current_index += 1
-        
-        if len(self.history) > self.max_history_size:
-            self.history.pop(0)
-            self.current_index -= 1
+        self._evict_history()
         
         self._notify_state_changed()
     
@@ -39,7 +84,9 @@ class EditorState:
             return False
         
         action = self.history[self.current_index]
-        action.undo(self.current_image)
+        start = time.perf_counter()
+        action.undo(self.current_image, self.renderer)
+        self.latency.record(action.kind, 'undo', time.perf_counter() - start)
         self.current_index -= 1
         self._notify_state_changed()
         return True
@@ -50,7 +97,9 @@ class EditorState:
         
         self.current_index += 1
         action = self.history[self.current_index]
-        action.execute(self.current_image)
+        start = time.perf_counter()
+        action.redo(self.current_image, self.renderer)
+        self.latency.record(action.kind, 'redo', time.perf_counter() - start)
         self._notify_state_changed()
         return True
     
@@ -68,21 +117,66 @@ class EditorState:
     def get_history_names(self) -> List[str]:
         return [action.name for action in self.history]
     
+    def get_history_memory_size(self) -> int:
+        return self.renderer.held_bytes if self.renderer else 0
+    
+    def get_history_spill_size(self) -> int:
+        return self.renderer.spill_bytes if self.renderer else 0
+    
     def reset_to_original(self):
         if self.current_image:
             self.current_image.reset_to_original()
-            self.history.clear()
-            self.current_index = -1
+            self.renderer.clear()
+            self._clear_history()
             self._notify_state_changed()
     
+    def _truncate_redo(self):
+        while len(self.history) > self.current_index + 1:
+            action = self.history.pop()
+            self.renderer.discard(action.filters_after)
+    
+    # Oldest entries go first; once one is dropped, the state it undid to can no longer be reached, so its checkpoint goes too.
+    def _evict_history(self):
+        while self.renderer.held_bytes > self.max_history_bytes and len(self.history) > 1:
+            action = self.history.popleft()
+            self.current_index -= 1
+            self.renderer.discard(action.filters_before)
+    
+    def _clear_history(self):
+        self.history.clear()
+        self.current_index = -1
+    
     def _notify_state_changed(self):
+        self.generation += 1
         if self.on_state_changed:
             self.on_state_changed()
 
 
+class PreviewSession:
+    max_preview_size = 1024
+    
+    # The proxy is taken from the state before the current run of adjustments, which the dragged level is applied to.
+    def __init__(self, base: PILImage.Image, run: List[tuple], adjustment: str):
+        self.adjustment = adjustment
+        self.run = run
+        self.start_level = adjustment_level(run, adjustment)
+        self.level = self.start_level
+        
+        proxy = base.copy()
+        proxy.thumbnail((self.max_preview_size, self.max_preview_size), PILImage.Resampling.BILINEAR, reducing_gap=2.0)
+        self.proxy = PhotonImage(proxy)
+    
+    def render(self, level: float) -> PILImage.Image:
+        self.level = level
+        preview = self.proxy.copy()
+        preview.apply_filters(with_adjustment_level(self.run, self.adjustment, level))
+        return preview.current
+
+
 class Editor:
     def __init__(self):
         self.state = EditorState()
+        self.preview_session: Optional[PreviewSession] = None
     
     def set_state_change_callback(self, callback: Callable):
         self.state.on_state_changed = callback
@@ -90,6 +184,7 @@ class Editor:
     def load_image_from_file(self, filepath: str):
         try:
             image = PhotonImage.from_file(filepath)
+            self.preview_session = None
             self.state.load_image(image)
             return True
         except Exception as e:
@@ -97,8 +192,49 @@ class Editor:
             return False
     
     def load_image(self, image: PhotonImage):
+        self.preview_session = None
         self.state.load_image(image)
     
+    def begin_preview(self, adjustment: str) -> bool:
+        image = self.state.current_image
+        if not image:
+            return False
+        
+        filters = image.applied_filters
+        start = adjustment_run(filters)
+        base = image.current if start == len(filters) else self.state.renderer.render(filters[:start])
+        self.preview_session = PreviewSession(base, filters[start:], adjustment)
+        return True
+    
+    def update_preview(self, level: float) -> Optional[PILImage.Image]:
+        if not self.preview_session:
+            return None
+        return self.preview_session.render(level)
+    
+    def commit_preview(self, level: Optional[float] = None) -> bool:
+        session, self.preview_session = self.preview_session, None
+        if not session:
+            return False
+        
+        level = session.level if level is None else level
+        if level == session.start_level:
+            return False
+        
+        self.set_adjustment(session.adjustment, level)
+        return True
+    
+    def get_adjustment_level(self, adjustment: str) -> float:
+        image = self.state.current_image
+        return adjustment_level(image.applied_filters, adjustment) if image else 1.0
+    
+    def set_adjustment(self, adjustment: str, level: float):
+        from .actions import AdjustmentAction
+        action = AdjustmentAction(adjustment, level)
+        self.state.execute_action(action)
+    
+    def cancel_preview(self):
+        self.preview_session = None
+    
     def apply_brightness(self, factor: float):
         from .actions import BrightnessAction
         action = BrightnessAction(factor)
@@ -155,6 +291,15 @@ class Editor:
     def redo(self) -> bool:
         return self.state.redo()
     
+    def get_history_memory_size(self) -> int:
+        return self.state.get_history_memory_size()
+    
+    def get_history_spill_size(self) -> int:
+        return self.state.get_history_spill_size()
+    
+    def get_history_latency(self) -> Dict[str, Dict[str, float]]:
+        return self.state.latency.summary()
+    
     def can_undo(self) -> bool:
         return self.state.can_undo()
     
@@ -171,3 +316,7 @@ class Editor:
     @property
     def current_image(self) -> Optional[PhotonImage]:
         return self.state.current_image
+    
+    @property
+    def generation(self) -> int:
+        return self.state.generation
@@ -1,69 +1,176 @@
-from PIL import Image as PILImage, ImageEnhance, ImageOps, ImageFilter, ImageDraw, ImageFont
-from typing import Optional, Tuple, List, Any
+from PIL import Image as PILImage, ImageEnhance, ImageOps, ImageFilter, ImageDraw, ImageFont, ImageMode
+from typing import Optional, Tuple, List, Any, Union
+from .pipeline import PointStage, compile_filters
 import io
 import copy
+import threading
+import weakref
+
+
+SEPIA_MATRIX = (
+    0.393, 0.769, 0.189, 0,
+    0.349, 0.686, 0.168, 0,
+    0.272, 0.534, 0.131, 0,
+)
+
+_live_buffers = set()
+_live_pixel_bytes = 0
+_peak_pixel_bytes = 0
+# Re-entrant because a buffer's finalizer can run from garbage collection triggered while the lock is held.
+_live_lock = threading.RLock()
+
+
+def pixel_bytes(image: PILImage.Image) -> int:
+    width, height = image.size
+    mode = ImageMode.getmode(image.mode)
+    return width * height * len(mode.bands) * int(mode.typestr[-1])
+
+
+def live_pixel_bytes() -> int:
+    return _live_pixel_bytes
+
+
+def peak_pixel_bytes() -> int:
+    return _peak_pixel_bytes
+
+
+def reset_peak_pixel_bytes():
+    global _peak_pixel_bytes
+    with _live_lock:
+        _peak_pixel_bytes = _live_pixel_bytes
+
+
+def _release_buffer(key: int, size: int):
+    global _live_pixel_bytes
+    with _live_lock:
+        _live_buffers.discard(key)
+        _live_pixel_bytes -= size
+
+
+# Buffers are counted once when first seen and uncounted when collected, so the total is kept without rescanning.
+def _track_buffer(image: PILImage.Image) -> PILImage.Image:
+    global _live_pixel_bytes, _peak_pixel_bytes
+    key = id(image)
+    with _live_lock:
+        if key in _live_buffers:
+            return image
+        size = pixel_bytes(image)
+        _live_buffers.add(key)
+        _live_pixel_bytes += size
+        _peak_pixel_bytes = max(_peak_pixel_bytes, _live_pixel_bytes)
+    weakref.finalize(image, _release_buffer, key, size)
+    return image
+
+
+FILTER_METHODS = {
+    'brightness': 'apply_brightness',
+    'contrast': 'apply_contrast',
+    'grayscale': 'apply_grayscale',
+    'invert': 'apply_invert',
+    'sepia': 'apply_sepia',
+    'rotate': 'rotate',
+    'flip_horizontal': 'flip_horizontal',
+    'flip_vertical': 'flip_vertical',
+    'resize': 'resize',
+    'crop': 'crop',
+}
 
 
 class PhotonImage:
+    # Pixel buffers are shared between original, current and copies, and are never modified in place.
+    # Every operation below builds a new PIL image, so a bitmap is only allocated when an edit runs.
     def __init__(self, pil_image: PILImage.Image):
-        self.original = pil_image.copy()
-        self.current = pil_image.copy()
+        self.original = pil_image
+        self.current = pil_image
         self.format = pil_image.format or 'PNG'
         self.applied_filters = []
         self.metadata = {}
         
     @classmethod
     def from_file(cls, filepath: str) -> 'PhotonImage':
-        pil_img = PILImage.open(filepath)
+        with PILImage.open(filepath) as pil_img:
+            pil_img.load()
         return cls(pil_img)
     
     @classmethod
     def from_bytes(cls, data: bytes) -> 'PhotonImage':
-        pil_img = PILImage.open(io.BytesIO(data))
+        with PILImage.open(io.BytesIO(data)) as pil_img:
+            pil_img.load()
         return cls(pil_img)
     
+    @property
+    def original(self) -> PILImage.Image:
+        return self._original
+    
+    @original.setter
+    def original(self, image: PILImage.Image):
+        self._original = _track_buffer(image)
+    
+    @property
+    def current(self) -> PILImage.Image:
+        return self._current
+    
+    @current.setter
+    def current(self, image: PILImage.Image):
+        self._current = _track_buffer(image)
+    
     def copy(self) -> 'PhotonImage':
         new_img = PhotonImage(self.current)
-        new_img.original = self.original.copy()
+        new_img.original = self.original
         new_img.format = self.format
         new_img.applied_filters = self.applied_filters.copy()
         new_img.metadata = self.metadata.copy()
         return new_img
     
     def reset_to_original(self):
-        self.current = self.original.copy()
+        self.current = self.original
         self.applied_filters.clear()
     
+    def apply_filters(self, filters: List[Tuple[str, Any]]):
+        for stage in compile_filters(filters):
+            self.apply_stage(stage)
+    
+    def apply_stage(self, stage: Union[PointStage, Tuple[str, Any]]):
+        if isinstance(stage, PointStage):
+            self._apply_point_stage(stage)
+            return
+        
+        name, param = stage
+        method = getattr(self, FILTER_METHODS[name])
+        if param is None:
+            method()
+        elif name == 'resize':
+            method(*param)
+        else:
+            method(param)
+    
+    def _apply_point_stage(self, stage: PointStage):
+        self.current = stage.apply(self.current)
+        self.applied_filters.extend(stage.operations)
+    
     def apply_brightness(self, factor: float):
-        enhancer = ImageEnhance.Brightness(self.current)
-        self.current = enhancer.enhance(factor)
-        self.applied_filters.append(('brightness', factor))
+        self._apply_point_stage(PointStage([('brightness', factor)]))
     
     def apply_contrast(self, factor: float):
-        enhancer = ImageEnhance.Contrast(self.current)
-        self.current = enhancer.enhance(factor)
-        self.applied_filters.append(('contrast', factor))
+        self._apply_point_stage(PointStage([('contrast', factor)]))
     
     def apply_grayscale(self):
-        self.current = ImageOps.grayscale(self.current).convert('RGB')
-        self.applied_filters.append(('grayscale', None))
+        self._apply_point_stage(PointStage([('grayscale', None)]))
     
     def apply_invert(self):
-        self.current = ImageOps.invert(self.current)
-        self.applied_filters.append(('invert', None))
+        self._apply_point_stage(PointStage([('invert', None)]))
     
     def apply_sepia(self):
-        pixels = self.current.load()
-        width, height = self.current.size
+        image = self.current
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
         
-        for y in range(height):
-            for x in range(width):
-                r, g, b = pixels[x, y][:3]
-                tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                pixels[x, y] = (min(255, tr), min(255, tg), min(255, tb))
+        sepia = image.convert('RGB').convert('RGB', SEPIA_MATRIX)
+        if image.mode == 'RGBA':
+            sepia.putalpha(image.getchannel('A'))
         
+        self.current = sepia
         self.applied_filters.append(('sepia', None))
     
     def rotate(self, degrees: float):
@@ -80,10 +187,12 @@ class PhotonImage:
     
     def resize(self, size: Tuple[int, int], keep_aspect: bool = True):
         if keep_aspect:
-            self.current.thumbnail(size, PILImage.Resampling.LANCZOS)
+            resized = self.current.copy()
+            resized.thumbnail(size, PILImage.Resampling.LANCZOS)
+            self.current = resized
         else:
             self.current = self.current.resize(size, PILImage.Resampling.LANCZOS)
-        self.applied_filters.append(('resize', size))
+        self.applied_filters.append(('resize', (size, keep_aspect)))
     
     def crop(self, box: Tuple[int, int, int, int]):
         self.current = self.current.crop(box)
@@ -0,0 +1,259 @@
+import os
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from .utils import is_image_file
+
+
+FLAG_DIR = 1
+FLAG_IMAGE = 2
+UNKNOWN = -1
+
+ListingRow = Tuple[str, int, int, float, int]
+
+
+class DirectoryListing:
+    # One column per field rather than an object per entry, so a 50k-file folder stays a handful of arrays.
+    def __init__(self, path: str, mtime_ns: int = 0):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.names: List[str] = []
+        self.flags = array('B')
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.inodes = array('Q')
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def is_dir(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_DIR)
+    
+    def is_image(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_IMAGE)
+    
+    def full_path(self, index: int) -> str:
+        return os.path.join(self.path, self.names[index])
+    
+    def size(self, index: int) -> int:
+        if self.sizes[index] == UNKNOWN:
+            self._stat(index)
+        return self.sizes[index]
+    
+    def mtime(self, index: int) -> float:
+        if self.mtimes[index] == UNKNOWN:
+            self._stat(index)
+        return self.mtimes[index]
+    
+    def entry(self, index: int) -> Tuple[str, bool, bool, str]:
+        return self.names[index], self.is_dir(index), self.is_image(index), self.full_path(index)
+    
+    def entries(self) -> Iterator[Tuple[str, bool, bool, str]]:
+        return (self.entry(index) for index in range(len(self)))
+    
+    # Directories sort first, then names case-insensitively, so an entry's row can be found by bisection.
+    def position(self, name: str, is_dir: bool) -> int:
+        directories = self._directory_count()
+        low, high = (0, directories) if is_dir else (directories, len(self))
+        key = name.lower()
+        while low < high:
+            middle = (low + high) // 2
+            if self.names[middle].lower() < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def find(self, name: str, is_dir: bool) -> int:
+        index = self.position(name, is_dir)
+        key = name.lower()
+        while index < len(self) and self.names[index].lower() == key:
+            if self.names[index] == name:
+                return index
+            index += 1
+        return -1
+    
+    def row(self, index: int) -> ListingRow:
+        return self.names[index], self.flags[index], self.sizes[index], self.mtimes[index], self.inodes[index]
+    
+    def insert(self, index: int, row: ListingRow):
+        name, flags, size, mtime, inode = row
+        self.names.insert(index, name)
+        self.flags.insert(index, flags)
+        self.sizes.insert(index, size)
+        self.mtimes.insert(index, mtime)
+        self.inodes.insert(index, inode)
+    
+    def remove(self, index: int):
+        del self.names[index]
+        del self.flags[index]
+        del self.sizes[index]
+        del self.mtimes[index]
+        del self.inodes[index]
+    
+    def replace(self, index: int, row: ListingRow):
+        self.names[index], self.flags[index], self.sizes[index], self.mtimes[index], self.inodes[index] = row
+    
+    def directories(self) -> List[str]:
+        return [name for name, flags in zip(self.names, self.flags) if flags & FLAG_DIR]
+    
+    def image_files(self) -> List[str]:
+        return [name for name, flags in zip(self.names, self.flags) if flags & FLAG_IMAGE]
+    
+    def sorted(self) -> 'DirectoryListing':
+        names = self.names
+        lowered = [name.lower() for name in names]
+        indices = range(len(self))
+        order = (sorted((index for index in indices if self.flags[index] & FLAG_DIR), key=lowered.__getitem__) +
+                 sorted((index for index in indices if not self.flags[index] & FLAG_DIR), key=lowered.__getitem__))
+        
+        result = DirectoryListing(self.path, self.mtime_ns)
+        result.names = [names[index] for index in order]
+        result.flags = array('B', [self.flags[index] for index in order])
+        result.sizes = array('q', [self.sizes[index] for index in order])
+        result.mtimes = array('d', [self.mtimes[index] for index in order])
+        result.inodes = array('Q', [self.inodes[index] for index in order])
+        return result
+    
+    def _directory_count(self) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.flags[middle] & FLAG_DIR:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _stat(self, index: int):
+        try:
+            stat = os.stat(self.full_path(index))
+            self.sizes[index], self.mtimes[index] = stat.st_size, stat.st_mtime
+        except OSError:
+            self.sizes[index], self.mtimes[index] = 0, 0.0
+
+
+def scan_directory(path: str, mtime_ns: int = 0) -> DirectoryListing:
+    listing = DirectoryListing(path, mtime_ns)
+    names, flags, sizes, mtimes, inodes = listing.names, listing.flags, listing.sizes, listing.mtimes, listing.inodes
+    # Windows fills DirEntry.stat from the directory read itself; elsewhere it costs a syscall, so it waits until asked for.
+    eager_stat = os.name == 'nt'
+    
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            
+            size = 0 if is_dir else UNKNOWN
+            mtime = float(UNKNOWN)
+            if eager_stat and not is_dir:
+                try:
+                    stat = entry.stat()
+                    size, mtime = stat.st_size, stat.st_mtime
+                except OSError:
+                    pass
+            
+            names.append(entry.name)
+            flags.append(FLAG_DIR if is_dir else FLAG_IMAGE if is_image_file(entry.name) else 0)
+            sizes.append(size)
+            mtimes.append(mtime)
+            # Inode numbers come with the directory read on POSIX and let renames be told apart from delete plus create.
+            inodes.append(0 if eager_stat else entry.inode())
+    
+    return listing.sorted()
+
+
+class ListingDiff:
+    def __init__(self):
+        self.removed: List[Tuple[str, int]] = []
+        self.renamed: List[Tuple[str, int, ListingRow]] = []
+        self.added: List[ListingRow] = []
+        self.changed: List[ListingRow] = []
+    
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.renamed or self.added or self.changed)
+
+
+def _same_kind(old: DirectoryListing, old_index: int, new: DirectoryListing, new_index: int) -> bool:
+    return (old.flags[old_index] & FLAG_DIR) == (new.flags[new_index] & FLAG_DIR)
+
+
+def _entry_changed(old: DirectoryListing, old_index: int, new: DirectoryListing, new_index: int) -> bool:
+    if old.inodes[old_index] != new.inodes[new_index]:
+        return True
+    # Stats are read lazily, so only entries whose size or date has already been looked at can be showing stale values.
+    if old.mtimes[old_index] == UNKNOWN:
+        return False
+    return old.sizes[old_index] != new.size(new_index) or old.mtimes[old_index] != new.mtime(new_index)
+
+
+def diff_listings(old: DirectoryListing, new: DirectoryListing) -> ListingDiff:
+    diff = ListingDiff()
+    old_rows = {name: index for index, name in enumerate(old.names)}
+    new_rows = {name: index for index, name in enumerate(new.names)}
+    
+    added = []
+    for index, name in enumerate(new.names):
+        old_index = old_rows.get(name)
+        if old_index is None or not _same_kind(old, old_index, new, index):
+            added.append(index)
+        elif _entry_changed(old, old_index, new, index):
+            diff.changed.append(new.row(index))
+    
+    # Inodes only pair a vanished entry with a new one; hard links sharing an inode still arrive as separate rows.
+    by_inode: Dict[int, List[int]] = {}
+    for index in added:
+        if new.inodes[index]:
+            by_inode.setdefault(new.inodes[index], []).append(index)
+    
+    paired = set()
+    for index, name in enumerate(old.names):
+        new_index = new_rows.get(name)
+        if new_index is not None and _same_kind(old, index, new, new_index):
+            continue
+        candidates = by_inode.get(old.inodes[index], []) if old.inodes[index] else []
+        match = next((candidate for candidate in candidates if _same_kind(old, index, new, candidate)), None)
+        if match is not None:
+            candidates.remove(match)
+            paired.add(match)
+            diff.renamed.append((name, old.flags[index], new.row(match)))
+        else:
+            diff.removed.append((name, old.flags[index]))
+    
+    diff.added = [new.row(index) for index in added if index not in paired]
+    return diff
+
+
+class ListingCache:
+    def __init__(self, max_directories: int = 32):
+        self.max_directories = max_directories
+        self.listings: 'OrderedDict[str, DirectoryListing]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, path: str) -> DirectoryListing:
+        path = os.path.abspath(path)
+        # Adding, removing or renaming an entry bumps the directory's mtime, so one stat tells whether the listing is stale.
+        mtime_ns = os.stat(path).st_mtime_ns
+        
+        listing = self.listings.get(path)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            self.listings.move_to_end(path)
+            self.hits += 1
+            return listing
+        
+        self.misses += 1
+        listing = scan_directory(path, mtime_ns)
+        self.listings[path] = listing
+        self.listings.move_to_end(path)
+        while len(self.listings) > self.max_directories:
+            self.listings.popitem(last=False)
+        return listing
+    
+    def invalidate(self, path: Optional[str] = None):
+        if path is None:
+            self.listings.clear()
+        else:
+            self.listings.pop(os.path.abspath(path), None)
@@ -0,0 +1,153 @@
+from PIL import Image as PILImage
+from typing import Any, Callable, List, Optional, Tuple, Union
+import struct
+
+
+POINT_OPERATIONS = ('brightness', 'contrast', 'invert', 'grayscale')
+ADJUSTMENTS = ('brightness', 'contrast')
+IDENTITY = list(range(256))
+
+
+def _float32(value: float) -> float:
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def blend_table(base: int, factor: float) -> List[int]:
+    # Mirrors ImagingBlend's single precision arithmetic so a table lookup matches ImageEnhance bit for bit.
+    alpha = _float32(factor)
+    table = []
+    for value in range(256):
+        result = _float32(base + _float32(alpha * (value - base)))
+        table.append(0 if result <= 0 else 255 if result >= 255 else int(result))
+    return table
+
+
+def is_point_operation(name: str) -> bool:
+    return name in POINT_OPERATIONS
+
+
+# Slider adjustments made since the last other edit form a run, in which each slider holds one absolute level.
+def adjustment_run(filters: List[Tuple[str, Any]]) -> int:
+    start = len(filters)
+    while start and filters[start - 1][0] in ADJUSTMENTS:
+        start -= 1
+    return start
+
+
+def adjustment_level(filters: List[Tuple[str, Any]], adjustment: str) -> float:
+    for name, param in reversed(filters[adjustment_run(filters):]):
+        if name == adjustment:
+            return param
+    return 1.0
+
+
+def with_adjustment_level(filters: List[Tuple[str, Any]], adjustment: str, level: float) -> List[Tuple[str, Any]]:
+    start = adjustment_run(filters)
+    run = filters[start:]
+    positions = [index for index, (name, param) in enumerate(run) if name == adjustment]
+    run = [entry for entry in run if entry[0] != adjustment]
+    if level != 1.0:
+        run.insert(positions[0] if positions else len(run), (adjustment, level))
+    return filters[:start] + run
+
+
+def luma_histogram(image: PILImage.Image) -> List[int]:
+    return (image if image.mode == 'L' else image.convert('L')).histogram()
+
+
+class PointStage:
+    def __init__(self, operations: Optional[List[Tuple[str, Any]]] = None):
+        self.operations = operations or []
+    
+    def add(self, name: str, param: Any = None):
+        self.operations.append((name, param))
+    
+    def apply(self, image: PILImage.Image) -> PILImage.Image:
+        image = to_point_mode(image)
+        steps = self.compile(image.mode, lambda steps: luma_histogram(run_point_steps(image, steps)))
+        return run_point_steps(image, steps)
+    
+    # Resolves the operations into LUT and grayscale steps; histogram(steps) returns the 'L' histogram of the
+    # input after those steps, which lets streaming callers gather it band by band.
+    def compile(self, mode: str, histogram: Callable[[List[Tuple[str, Any]]], List[int]]) -> List[Tuple[str, Any]]:
+        steps = []
+        tables = [IDENTITY] * (1 if mode in ('L', 'LA') else 3)
+        current_histogram = None
+        to_rgb = False
+        
+        for name, param in self.operations:
+            if name == 'grayscale':
+                steps += [('lut', tables), ('grayscale', None)]
+                tables = [IDENTITY]
+                current_histogram = None
+                to_rgb = True
+                continue
+            
+            if name == 'brightness':
+                table = blend_table(0, param)
+            elif name == 'contrast':
+                if len(tables) == 1:
+                    if current_histogram is None:
+                        current_histogram = histogram(steps)
+                    mean = self._mean(current_histogram, tables[0])
+                else:
+                    # ImageEnhance.Contrast averages the rounded 'L' conversion, which per-channel histograms cannot reproduce,
+                    # so each contrast step here costs a full LUT pass and 'L' conversion; only the final pass is fused.
+                    mean = self._mean(histogram(steps + [('lut', tables)]), IDENTITY)
+                table = blend_table(mean, param)
+            elif name == 'invert':
+                table = IDENTITY[::-1]
+            else:
+                raise ValueError(f"Not a point operation: {name}")
+            
+            tables = [[table[value] for value in channel] for channel in tables]
+        
+        steps.append(('lut', tables))
+        if to_rgb:
+            steps.append(('rgb', None))
+        return steps
+    
+    @staticmethod
+    def _mean(histogram: List[int], table: List[int]) -> int:
+        total = sum(histogram) or 1
+        return int(sum(count * table[value] for value, count in enumerate(histogram)) / total + 0.5)
+
+
+def to_point_mode(image: PILImage.Image) -> PILImage.Image:
+    if image.mode in ('L', 'LA', 'RGB', 'RGBA'):
+        return image
+    has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def run_point_steps(image: PILImage.Image, steps: List[Tuple[str, Any]]) -> PILImage.Image:
+    for kind, value in steps:
+        if kind == 'lut':
+            image = _apply_tables(image, value)
+        elif kind == 'grayscale':
+            image = image.convert('L')
+        elif kind == 'rgb':
+            image = image.convert('RGB')
+    return image
+
+
+def _apply_tables(image: PILImage.Image, tables: List[List[int]]) -> PILImage.Image:
+    if all(table == IDENTITY for table in tables):
+        return image
+    
+    lut = [value for table in tables for value in table]
+    if 'A' in image.getbands():
+        lut += IDENTITY
+    return image.point(lut)
+
+
+def compile_filters(filters: List[Tuple[str, Any]]) -> List[Union[PointStage, Tuple[str, Any]]]:
+    stages = []
+    for name, param in filters:
+        if is_point_operation(name):
+            if not stages or not isinstance(stages[-1], PointStage):
+                stages.append(PointStage())
+            stages[-1].add(name, param)
+        else:
+            stages.append((name, param))
+    return stages
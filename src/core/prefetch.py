@@ -0,0 +1,140 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from PIL import Image as PILImage
+from .image import pixel_bytes
+
+
+def _identity(filepath: str) -> Tuple[int, int]:
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def decode_image(filepath: str) -> PILImage.Image:
+    with PILImage.open(filepath) as image:
+        image.load()
+    return image
+
+
+class DecodedImageCache:
+    def __init__(self, max_bytes: int = 768 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: 'OrderedDict[str, Tuple[Tuple[int, int], PILImage.Image]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def get(self, filepath: str) -> Optional[PILImage.Image]:
+        filepath = os.path.abspath(filepath)
+        try:
+            identity = _identity(filepath)
+        except OSError:
+            identity = None
+        
+        with self._lock:
+            entry = self.entries.get(filepath)
+            # A file rewritten since it was decoded is dropped rather than served stale.
+            if entry is None or entry[0] != identity:
+                if entry is not None:
+                    self._remove(filepath)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(filepath)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, filepath: str, image: PILImage.Image, identity: Optional[Tuple[int, int]] = None):
+        filepath = os.path.abspath(filepath)
+        size = pixel_bytes(image)
+        if size > self.max_bytes:
+            return
+        
+        try:
+            identity = identity or _identity(filepath)
+        except OSError:
+            return
+        
+        with self._lock:
+            self._remove(filepath)
+            self.entries[filepath] = (identity, image)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                self._remove(next(iter(self.entries)))
+    
+    def __contains__(self, filepath: str) -> bool:
+        with self._lock:
+            return os.path.abspath(filepath) in self.entries
+    
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+    
+    def _remove(self, filepath: str):
+        entry = self.entries.pop(filepath, None)
+        if entry is not None:
+            self.total_bytes -= pixel_bytes(entry[1])
+
+
+class ImagePrefetcher:
+    def __init__(self, cache: Optional[DecodedImageCache] = None, max_workers: int = 2):
+        self.cache = cache or DecodedImageCache()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    # Paths are given nearest first; anything queued for an earlier position that is no longer wanted is dropped.
+    def prefetch(self, filepaths: List[str]):
+        wanted = [os.path.abspath(path) for path in filepaths]
+        submitted = []
+        with self._lock:
+            stale = [future for path, future in self._pending.items() if path not in wanted]
+            for path in wanted:
+                if path in self._pending or path in self.cache:
+                    continue
+                future = self.executor.submit(self._decode, path)
+                self._pending[path] = future
+                submitted.append((path, future))
+        
+        # Cancelling, or attaching to a future that has already finished, runs _on_done right here, so both happen
+        # outside the lock it takes.
+        for future in stale:
+            future.cancel()
+        for path, future in submitted:
+            future.add_done_callback(lambda done, path=path: self._on_done(path, done))
+    
+    def get(self, filepath: str) -> Optional[PILImage.Image]:
+        return self.cache.get(os.path.abspath(filepath))
+    
+    # The decode in flight for filepath, if any, so a caller can chain onto it instead of decoding the file again.
+    def pending(self, filepath: str) -> Optional[Future]:
+        with self._lock:
+            return self._pending.get(os.path.abspath(filepath))
+    
+    def put(self, filepath: str, image: PILImage.Image):
+        self.cache.put(filepath, image)
+    
+    def cancel_all(self):
+        with self._lock:
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            future.cancel()
+    
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+    
+    def _decode(self, filepath: str) -> PILImage.Image:
+        identity = _identity(filepath)
+        image = decode_image(filepath)
+        self.cache.put(filepath, image, identity)
+        return image
+    
+    def _on_done(self, filepath: str, future: Future):
+        with self._lock:
+            if self._pending.get(filepath) is future:
+                del self._pending[filepath]
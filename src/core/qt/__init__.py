@@ -0,0 +1,7 @@
+from .convert import pil_to_display_qimage, pil_to_qimage, pil_to_qpixmap, qpixmap_to_pil, scale_pixmap_smooth, create_thumbnail
+from .overlays import *
+from .explorer import FileExplorer
+from .loader import ImageLoader
+from .thumbnails import ThumbnailService
+from .listing_model import DirectoryListModel
+from .watcher import DirectoryWatcher
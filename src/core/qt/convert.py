@@ -0,0 +1,75 @@
+from PIL import Image as PILImage
+from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import Qt
+
+
+QIMAGE_FORMATS = {
+    'RGB': QImage.Format_RGBX8888,
+    'RGBA': QImage.Format_RGBA8888,
+    'L': QImage.Format_Grayscale8,
+}
+
+
+def pil_to_qimage(pil_image: PILImage.Image) -> QImage:
+    if pil_image.mode not in QIMAGE_FORMATS:
+        if pil_image.mode == '1':
+            pil_image = pil_image.convert('L')
+        else:
+            has_alpha = 'A' in pil_image.getbands() or 'transparency' in pil_image.info
+            pil_image = pil_image.convert('RGBA' if has_alpha else 'RGB')
+    
+    width, height = pil_image.size
+    qimage = QImage(width, height, QIMAGE_FORMATS[pil_image.mode])
+    if qimage.isNull() or not width or not height:
+        return qimage
+    
+    # The QImage owns its pixels; Pillow's native 4-byte RGB matches RGBX8888, so one paste into the mapped
+    # scanlines is the only copy.
+    target = PILImage.core.map_buffer(qimage.bits(), (width, height), 'raw', 0,
+                                      (pil_image.mode, qimage.bytesPerLine(), 1))
+    target.paste(pil_image.im, (0, 0, width, height))
+    return qimage
+
+
+def pil_to_qpixmap(pil_image: PILImage.Image) -> QPixmap:
+    return QPixmap.fromImage(pil_to_qimage(pil_image))
+
+
+# Safe off the GUI thread: the result owns its pixels and is already in the format the raster engine blits,
+# so turning it into a pixmap later is a plain copy.
+def pil_to_display_qimage(pil_image: PILImage.Image) -> QImage:
+    qimage = pil_to_qimage(pil_image)
+    if qimage.hasAlphaChannel():
+        return qimage.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return qimage.convertToFormat(QImage.Format_RGB32)
+
+
+def qpixmap_to_pil(qpixmap: QPixmap) -> PILImage.Image:
+    qimage = qpixmap.toImage()
+    buffer = qimage.bits()
+    width = qimage.width()
+    height = qimage.height()
+    
+    if qimage.format() == QImage.Format_RGB32:
+        pil_image = PILImage.frombuffer("RGB", (width, height), buffer, "raw", "BGRX", 0, 1)
+    elif qimage.format() == QImage.Format_ARGB32:
+        pil_image = PILImage.frombuffer("RGBA", (width, height), buffer, "raw", "BGRA", 0, 1)
+    else:
+        qimage = qimage.convertToFormat(QImage.Format_RGB32)
+        buffer = qimage.bits()
+        pil_image = PILImage.frombuffer("RGB", (width, height), buffer, "raw", "BGRX", 0, 1)
+    
+    return pil_image
+
+
+def scale_pixmap_smooth(pixmap: QPixmap, size, keep_aspect_ratio=True) -> QPixmap:
+    if keep_aspect_ratio:
+        return pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    else:
+        return pixmap.scaled(size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+
+def create_thumbnail(pil_image: PILImage.Image, size=(128, 128)) -> QPixmap:
+    thumbnail = pil_image.copy()
+    thumbnail.thumbnail(size, PILImage.Resampling.LANCZOS)
+    return pil_to_qpixmap(thumbnail)
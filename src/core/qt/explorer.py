@@ -3,7 +3,8 @@ import json
 from typing import List, Optional, Callable
 from pathlib import Path
 from PySide6.QtCore import QObject, Signal
-from .utils import is_image_file
+from ..listing import DirectoryListing, ListingCache
+from ..utils import is_image_file
 
 
 class FileExplorer(QObject):
@@ -19,6 +20,7 @@ class FileExplorer(QObject):
         self.max_history = 100
         self.recent_files: List[str] = []
         self.max_recent_files = 10
+        self.listing_cache = ListingCache()
         
         self._load_config()
     
@@ -77,44 +79,21 @@ class FileExplorer(QObject):
         else:
             return ['/']
     
-    def get_directories(self, path: str = None) -> List[str]:
+    def list_directory(self, path: str = None) -> DirectoryListing:
         path = path or self.current_path
         try:
-            items = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    items.append(item)
-            return sorted(items, key=str.lower)
+            return self.listing_cache.get(path)
         except (PermissionError, OSError):
-            return []
+            return DirectoryListing(path)
+    
+    def get_directories(self, path: str = None) -> List[str]:
+        return self.list_directory(path).directories()
     
     def get_image_files(self, path: str = None) -> List[str]:
-        path = path or self.current_path
-        try:
-            items = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isfile(item_path) and is_image_file(item):
-                    items.append(item)
-            return sorted(items, key=str.lower)
-        except (PermissionError, OSError):
-            return []
+        return self.list_directory(path).image_files()
     
     def get_all_files(self, path: str = None) -> List[tuple]:
-        path = path or self.current_path
-        try:
-            items = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                is_dir = os.path.isdir(item_path)
-                is_image = is_image_file(item) if not is_dir else False
-                items.append((item, is_dir, is_image, item_path))
-            
-            items.sort(key=lambda x: (not x[1], x[0].lower()))
-            return items
-        except (PermissionError, OSError):
-            return []
+        return list(self.list_directory(path).entries())
     
     def get_full_path(self, filename: str) -> str:
         return os.path.join(self.current_path, filename)
@@ -0,0 +1,224 @@
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QColor, QFont, QIcon, QPixmap
+from PySide6.QtWidgets import QApplication, QStyle
+from ..listing import FLAG_DIR, DirectoryListing, ListingDiff, ListingRow, diff_listings
+
+
+FULL_PATH_ROLE = Qt.UserRole
+IS_DIRECTORY_ROLE = Qt.UserRole + 1
+IS_IMAGE_ROLE = Qt.UserRole + 2
+SIZE_ROLE = Qt.UserRole + 3
+
+EXTENSION_ICONS = {
+    **dict.fromkeys(('.txt', '.md', '.log', '.py', '.js', '.html', '.css'), QStyle.StandardPixmap.SP_FileDialogDetailedView),
+    **dict.fromkeys(('.exe', '.msi', '.app'), QStyle.StandardPixmap.SP_ComputerIcon),
+    **dict.fromkeys(('.zip', '.rar', '.7z', '.tar', '.gz'), QStyle.StandardPixmap.SP_DriveHDIcon),
+}
+
+
+class DirectoryListModel(QAbstractListModel):
+    BATCH_SIZE = 1000
+    MAX_THUMBNAILS = 1000
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.listing = DirectoryListing('')
+        self.loaded = 0
+        self.show_thumbnails = False
+        self.thumbnails: 'OrderedDict[str, QPixmap]' = OrderedDict()
+        self.icons: Dict[QStyle.StandardPixmap, QIcon] = {}
+        self.directory_font = QFont()
+        self.directory_font.setBold(True)
+        self.directory_color = QColor(Qt.GlobalColor.yellow)
+        self.image_color = QColor(Qt.GlobalColor.green)
+        self.file_color = QColor(Qt.GlobalColor.lightGray)
+    
+    def set_listing(self, listing: DirectoryListing):
+        self.beginResetModel()
+        self.listing = listing
+        self.loaded = min(len(listing), self.BATCH_SIZE)
+        self.thumbnails.clear()
+        self.endResetModel()
+    
+    def set_thumbnails_visible(self, visible: bool):
+        if visible == self.show_thumbnails:
+            return
+        self.show_thumbnails = visible
+        if self.loaded:
+            self.dataChanged.emit(self.index(0), self.index(self.loaded - 1), [Qt.DecorationRole])
+    
+    def has_thumbnail(self, name: str) -> bool:
+        return name in self.thumbnails
+    
+    def set_thumbnail(self, name: str, pixmap: QPixmap):
+        self.thumbnails[name] = pixmap
+        self.thumbnails.move_to_end(name)
+        while len(self.thumbnails) > self.MAX_THUMBNAILS:
+            self.thumbnails.popitem(last=False)
+        
+        row = self.listing.find(name, False)
+        if row < 0:
+            return
+        # Reading the stats now lets a later rescan notice the file being rewritten and drop this pixmap.
+        self.listing.mtime(row)
+        if row < self.loaded:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+    
+    # Brings the shown listing in line with a fresh scan of the same directory through row-level
+    # inserts, removals and moves, so selection and scroll position survive.
+    def update_listing(self, listing: DirectoryListing) -> Optional[ListingDiff]:
+        if listing is self.listing:
+            return None
+        
+        diff = diff_listings(self.listing, listing)
+        for name, flags in diff.removed:
+            self.thumbnails.pop(name, None)
+            self._remove_row(self.listing.find(name, bool(flags & FLAG_DIR)))
+        for name, flags, row in diff.renamed:
+            thumbnail = self.thumbnails.pop(name, None)
+            if thumbnail is not None:
+                self.thumbnails[row[0]] = thumbnail
+            self._rename_row(self.listing.find(name, bool(flags & FLAG_DIR)), row)
+        for row in diff.added:
+            self.thumbnails.pop(row[0], None)
+            self._insert_row(row)
+        for row in diff.changed:
+            self.thumbnails.pop(row[0], None)
+            self._change_row(row)
+        self.listing.mtime_ns = listing.mtime_ns
+        return diff
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.loaded
+    
+    # Rows are handed to the view a batch at a time as it scrolls, so a huge folder never lays out every entry up front.
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.loaded < len(self.listing)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        
+        count = min(self.BATCH_SIZE, len(self.listing) - self.loaded)
+        if count <= 0:
+            return
+        
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        
+        row = index.row()
+        listing = self.listing
+        if role == Qt.DisplayRole:
+            return listing.names[row]
+        if role == Qt.DecorationRole:
+            if self.show_thumbnails:
+                thumbnail = self.thumbnails.get(listing.names[row])
+                if thumbnail is not None:
+                    return thumbnail
+            return self._icon(row)
+        if role == Qt.ForegroundRole:
+            if listing.is_dir(row):
+                return self.directory_color
+            return self.image_color if listing.is_image(row) else self.file_color
+        if role == Qt.FontRole:
+            return self.directory_font if listing.is_dir(row) else None
+        if role == FULL_PATH_ROLE:
+            return listing.full_path(row)
+        if role == IS_DIRECTORY_ROLE:
+            return listing.is_dir(row)
+        if role == IS_IMAGE_ROLE:
+            return listing.is_image(row)
+        if role == SIZE_ROLE:
+            return listing.size(row)
+        return None
+    
+    def index_for_name(self, name: str) -> QModelIndex:
+        row = self.listing.find(name, False)
+        if row < 0:
+            row = self.listing.find(name, True)
+        if row < 0:
+            return QModelIndex()
+        
+        while row >= self.loaded:
+            self.fetchMore()
+        return self.index(row)
+    
+    def _remove_row(self, index: int):
+        if index < 0:
+            return
+        if index >= self.loaded:
+            self.listing.remove(index)
+            return
+        
+        self.beginRemoveRows(QModelIndex(), index, index)
+        self.listing.remove(index)
+        self.loaded -= 1
+        self.endRemoveRows()
+    
+    def _insert_row(self, row: ListingRow):
+        index = self.listing.position(row[0], bool(row[1] & FLAG_DIR))
+        if index > self.loaded or (index == self.loaded and self.loaded < len(self.listing)):
+            self.listing.insert(index, row)
+            return
+        
+        self.beginInsertRows(QModelIndex(), index, index)
+        self.listing.insert(index, row)
+        self.loaded += 1
+        self.endInsertRows()
+    
+    def _change_row(self, row: ListingRow):
+        index = self.listing.find(row[0], bool(row[1] & FLAG_DIR))
+        if index < 0:
+            return
+        
+        self.listing.replace(index, row)
+        if index < self.loaded:
+            model_index = self.index(index)
+            self.dataChanged.emit(model_index, model_index)
+    
+    def _rename_row(self, index: int, row: ListingRow):
+        if index < 0:
+            self._insert_row(row)
+            return
+        
+        target = self.listing.position(row[0], bool(row[1] & FLAG_DIR))
+        if target in (index, index + 1):
+            self.listing.replace(index, row)
+            if index < self.loaded:
+                model_index = self.index(index)
+                self.dataChanged.emit(model_index, model_index)
+            return
+        
+        if index >= self.loaded or target > self.loaded:
+            self._remove_row(index)
+            self._insert_row(row)
+            return
+        
+        self.beginMoveRows(QModelIndex(), index, index, QModelIndex(), target)
+        self.listing.remove(index)
+        self.listing.insert(target if target < index else target - 1, row)
+        self.endMoveRows()
+    
+    def _icon(self, row: int) -> QIcon:
+        if self.listing.is_dir(row):
+            kind = QStyle.StandardPixmap.SP_DirIcon
+        elif self.listing.is_image(row):
+            kind = QStyle.StandardPixmap.SP_DesktopIcon
+        else:
+            extension = os.path.splitext(self.listing.names[row])[1].lower()
+            kind = EXTENSION_ICONS.get(extension, QStyle.StandardPixmap.SP_FileIcon)
+        
+        icon = self.icons.get(kind)
+        if icon is None:
+            icon = QApplication.style().standardIcon(kind)
+            self.icons[kind] = icon
+        return icon
@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+from PIL import Image as PILImage
+from PySide6.QtCore import QObject, Signal
+from ..image import PhotonImage
+from ..prefetch import ImagePrefetcher
+from ..thumbnails import read_embedded_preview
+
+
+class ImageLoader(QObject):
+    preview_ready = Signal(int, str, object, object)
+    image_ready = Signal(int, str, object)
+    load_failed = Signal(int, str, str)
+    
+    def __init__(self, preview_size: Tuple[int, int] = (1024, 1024), prefetcher: Optional[ImagePrefetcher] = None):
+        super().__init__()
+        self.preview_size = preview_size
+        self.prefetcher = prefetcher
+        self.generation = 0
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-loader')
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+    
+    def load(self, filepath: str) -> int:
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            if self._future:
+                self._future.cancel()
+            self._future = self.executor.submit(self._load, generation, filepath)
+        return generation
+    
+    def cancel(self):
+        with self._lock:
+            self.generation += 1
+            if self._future:
+                self._future.cancel()
+                self._future = None
+    
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+    
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
+    
+    def _load(self, generation: int, filepath: str):
+        if self.prefetcher:
+            cached = self.prefetcher.get(filepath)
+            if cached is not None:
+                if self.is_current(generation):
+                    self.image_ready.emit(generation, filepath, PhotonImage(cached))
+                return
+            
+            # A neighbour already being decoded finishes this request when it lands, without holding a loader thread.
+            pending = self.prefetcher.pending(filepath)
+            if pending is not None:
+                pending.add_done_callback(lambda future: self._on_prefetched(generation, filepath, future))
+                return
+        self._decode(generation, filepath)
+    
+    def _on_prefetched(self, generation: int, filepath: str, future: Future):
+        if not self.is_current(generation):
+            return
+        if not future.cancelled() and future.exception() is None:
+            self.image_ready.emit(generation, filepath, PhotonImage(future.result()))
+            return
+        
+        with self._lock:
+            if self.is_current(generation):
+                self._future = self.executor.submit(self._decode, generation, filepath)
+    
+    def _decode(self, generation: int, filepath: str):
+        try:
+            with PILImage.open(filepath) as image:
+                full_size = image.size
+                if image.format == 'JPEG':
+                    image.draft('RGB', self.preview_size)
+                    image.load()
+                    preview = image
+                else:
+                    preview = read_embedded_preview(image, self.preview_size)
+                if preview is not None and self.is_current(generation):
+                    self.preview_ready.emit(generation, filepath, preview, full_size)
+            
+            # A newer request has already replaced this one; skip the full decode.
+            if not self.is_current(generation):
+                return
+            
+            photon_image = PhotonImage.from_file(filepath)
+            if self.prefetcher:
+                self.prefetcher.put(filepath, photon_image.original)
+            if self.is_current(generation):
+                self.image_ready.emit(generation, filepath, photon_image)
+        except PILImage.DecompressionBombError as e:
+            # Only batch mode streams oversized images (through core.tiled); the editor needs the whole frame in memory.
+            if self.is_current(generation):
+                self.load_failed.emit(generation, filepath, f"{e} Use 'batch' mode to process it in streaming bands.")
+        except Exception as e:
+            if self.is_current(generation):
+                self.load_failed.emit(generation, filepath, str(e))
@@ -33,6 +33,9 @@ class Overlay(ABC):
     def draw(self, painter: QPainter, image_rect: QRect, zoom_factor: float):
         pass
     
+    def bounding_rect(self, image_rect: QRect, zoom_factor: float) -> QRect:
+        return QRect(image_rect)
+    
     def set_visible(self, visible: bool):
         self.visible = visible
     
@@ -325,25 +328,83 @@ class ShapeOverlay(Overlay):
         elif self.shape_type == "line":
             painter.drawLine(scaled_start, scaled_end)
     
+    def bounding_rect(self, image_rect: QRect, zoom_factor: float) -> QRect:
+        scaled_start = QPoint(
+            int(self.start_point.x() * zoom_factor + image_rect.left()),
+            int(self.start_point.y() * zoom_factor + image_rect.top())
+        )
+        scaled_end = QPoint(
+            int(self.end_point.x() * zoom_factor + image_rect.left()),
+            int(self.end_point.y() * zoom_factor + image_rect.top())
+        )
+        margin = self.line_width + 1
+        return QRect(scaled_start, scaled_end).normalized().adjusted(-margin, -margin, margin, margin)
+    
     def set_points(self, start_point: QPoint, end_point: QPoint):
         self.start_point = start_point
         self.end_point = end_point
 
 
 class PixelInfoOverlay(Overlay):
-    def __init__(self, position: QPoint, pixel_color: QColor):
+    HISTOGRAM_HEIGHT = 40
+    
+    def __init__(self, position: QPoint, pixel_color: QColor, histogram: Optional[List[List[int]]] = None):
         super().__init__("Pixel Info")
         self.position = position
         self.pixel_color = pixel_color
+        self.histogram = histogram
         self.show_color_sample = True
     
     def draw(self, painter: QPainter, image_rect: QRect, zoom_factor: float):
         if not self.visible:
             return
         
-        font = QFont("Arial", 10)
+        font, info_text, text_rect = self._layout(image_rect, zoom_factor)
         painter.setFont(font)
         
+        painter.fillRect(text_rect.adjusted(-4, -2, 4, 2), QColor(0, 0, 0, 200))
+        
+        pen = QPen(QColor(255, 255, 255))
+        painter.setPen(pen)
+        painter.drawText(text_rect, Qt.TextFlag.TextWordWrap, info_text)
+        
+        if self.show_color_sample:
+            sample_rect = QRect(text_rect.right() + 5, text_rect.top(), 20, 20)
+            painter.fillRect(sample_rect, self.pixel_color)
+            painter.drawRect(sample_rect)
+        
+        if self.histogram:
+            self._draw_histogram(painter, self._histogram_rect(text_rect))
+    
+    def _draw_histogram(self, painter: QPainter, rect: QRect):
+        painter.fillRect(rect.adjusted(-4, -2, 4, 2), QColor(0, 0, 0, 200))
+        
+        peak = max(max(channel) for channel in self.histogram) or 1
+        colors = [QColor(255, 80, 80, 200), QColor(80, 255, 80, 200), QColor(80, 140, 255, 200)]
+        bin_width = rect.width() / 256
+        
+        for channel, color in zip(self.histogram, colors):
+            painter.setPen(QPen(color, 1))
+            for value, count in enumerate(channel):
+                if count:
+                    x = int(rect.left() + value * bin_width)
+                    painter.drawLine(x, rect.bottom(), x, rect.bottom() - int(count / peak * rect.height()))
+    
+    def _histogram_rect(self, text_rect: QRect) -> QRect:
+        return QRect(text_rect.left(), text_rect.bottom() + 6, max(text_rect.width(), 128), self.HISTOGRAM_HEIGHT)
+    
+    def bounding_rect(self, image_rect: QRect, zoom_factor: float) -> QRect:
+        _, _, text_rect = self._layout(image_rect, zoom_factor)
+        bounds = text_rect.adjusted(-4, -2, 4, 2)
+        if self.show_color_sample:
+            bounds = bounds.united(QRect(text_rect.right() + 5, text_rect.top(), 21, 21))
+        if self.histogram:
+            bounds = bounds.united(self._histogram_rect(text_rect).adjusted(-4, -2, 5, 3))
+        return bounds
+    
+    def _layout(self, image_rect: QRect, zoom_factor: float) -> Tuple[QFont, str, QRect]:
+        font = QFont("Arial", 10)
+        
         scaled_pos = QPoint(
             int(self.position.x() * zoom_factor + image_rect.left()),
             int(self.position.y() * zoom_factor + image_rect.top())
@@ -355,23 +416,17 @@ class PixelInfoOverlay(Overlay):
         metrics = QFontMetrics(font)
         text_rect = metrics.boundingRect(QRect(), Qt.TextFlag.TextWordWrap, info_text)
         
-        info_pos = QPoint(scaled_pos.x() + 15, scaled_pos.y() - text_rect.height() - 25)
+        offset = text_rect.height() + 25
+        if self.histogram:
+            offset += self.HISTOGRAM_HEIGHT + 8
+        info_pos = QPoint(scaled_pos.x() + 15, scaled_pos.y() - offset)
         text_rect.moveTopLeft(info_pos)
-        
-        painter.fillRect(text_rect.adjusted(-4, -2, 4, 2), QColor(0, 0, 0, 200))
-        
-        pen = QPen(QColor(255, 255, 255))
-        painter.setPen(pen)
-        painter.drawText(text_rect, Qt.TextFlag.TextWordWrap, info_text)
-        
-        if self.show_color_sample:
-            sample_rect = QRect(text_rect.right() + 5, text_rect.top(), 20, 20)
-            painter.fillRect(sample_rect, self.pixel_color)
-            painter.drawRect(sample_rect)
+        return font, info_text, text_rect
     
-    def update_info(self, position: QPoint, pixel_color: QColor):
+    def update_info(self, position: QPoint, pixel_color: QColor, histogram: Optional[List[List[int]]] = None):
         self.position = position
         self.pixel_color = pixel_color
+        self.histogram = histogram
 
 
 class OverlayManager:
@@ -0,0 +1,107 @@
+import os
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from PIL import Image as PILImage
+from PySide6.QtCore import QObject, Signal
+from ..thumbnails import ThumbnailCache, create_thumbnail_image
+
+
+class ThumbnailService(QObject):
+    thumbnail_ready = Signal(str, object, object)
+    thumbnail_failed = Signal(str)
+    
+    def __init__(self, size: Tuple[int, int] = (160, 160), cache: Optional[ThumbnailCache] = None,
+                 max_workers: Optional[int] = None):
+        super().__init__()
+        self.size = size
+        self.cache = cache or ThumbnailCache()
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='thumbnail')
+        self._queue: List[Tuple[int, int, str]] = []
+        self._queued: Dict[str, Tuple[int, int, str]] = {}
+        self._running: Dict[str, Future] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+    
+    # Lower priorities load first. Work is held in a heap and handed to the pool only as workers free up,
+    # so re-prioritising or cancelling queued requests is cheap and never waits behind stale work.
+    def request(self, filepath: str, priority: int = 0):
+        with self._lock:
+            if filepath in self._running:
+                return
+            queued = self._queued.get(filepath)
+            if queued and queued[0] == priority:
+                return
+            entry = (priority, next(self._sequence), filepath)
+            self._queued[filepath] = entry
+            heapq.heappush(self._queue, entry)
+        self._dispatch()
+    
+    def cancel(self, filepath: str):
+        with self._lock:
+            self._queued.pop(filepath, None)
+            future = self._running.get(filepath)
+        if future:
+            future.cancel()
+    
+    def cancel_all(self):
+        with self._lock:
+            self._queue.clear()
+            self._queued.clear()
+            futures = list(self._running.values())
+        for future in futures:
+            future.cancel()
+    
+    def is_pending(self, filepath: str) -> bool:
+        with self._lock:
+            return filepath in self._queued or filepath in self._running
+    
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+    
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            while self._queue and len(self._running) < self.max_workers:
+                entry = heapq.heappop(self._queue)
+                filepath = entry[2]
+                # Entries that were cancelled or re-queued at another priority are left in the heap and skipped here.
+                if self._queued.get(filepath) is not entry:
+                    continue
+                del self._queued[filepath]
+                future = self.executor.submit(self._load, filepath)
+                self._running[filepath] = future
+                started.append((filepath, future))
+        
+        for filepath, future in started:
+            future.add_done_callback(lambda done, path=filepath: self._on_done(path, done))
+    
+    def _load(self, filepath: str) -> Tuple[PILImage.Image, Tuple[int, int]]:
+        key = self.cache.cache_key(filepath, self.size)
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        
+        image, full_size = create_thumbnail_image(filepath, self.size)
+        self.cache.put(key, image, full_size)
+        return image, full_size
+    
+    # Runs on the worker thread; the signals are queued to receivers living on the GUI thread.
+    def _on_done(self, filepath: str, future: Future):
+        with self._lock:
+            if self._running.get(filepath) is future:
+                del self._running[filepath]
+        self._dispatch()
+        
+        if future.cancelled():
+            return
+        try:
+            image, full_size = future.result()
+        except Exception:
+            self.thumbnail_failed.emit(filepath)
+            return
+        self.thumbnail_ready.emit(filepath, image, full_size)
@@ -0,0 +1,50 @@
+import os
+from typing import Optional
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from ..listing import ListingCache
+
+
+class DirectoryWatcher(QObject):
+    directory_changed = Signal(str, object)
+    
+    def __init__(self, listing_cache: ListingCache, delay_ms: int = 200):
+        super().__init__()
+        self.listing_cache = listing_cache
+        self.path: Optional[str] = None
+        
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._flush)
+    
+    def watch(self, path: Optional[str]):
+        self.timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        
+        self.path = os.path.abspath(path) if path else None
+        if self.path:
+            self.watcher.addPath(self.path)
+    
+    def _on_directory_changed(self, path: str):
+        # A copy of a thousand files fires a thousand events; the first one opens a window and the rest ride along with it.
+        if not self.timer.isActive():
+            self.timer.start()
+    
+    def _flush(self):
+        if not self.path:
+            return
+        
+        # The event already proves a change; on filesystems with coarse directory mtimes the cache could not tell.
+        self.listing_cache.invalidate(self.path)
+        try:
+            listing = self.listing_cache.get(self.path)
+        except OSError:
+            return
+        
+        if self.path not in self.watcher.directories() and os.path.isdir(self.path):
+            self.watcher.addPath(self.path)
+        self.directory_changed.emit(self.path, listing)
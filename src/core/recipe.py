@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from PIL import Image as PILImage
+from typing import Any, List, Optional, Tuple
+from .image import PhotonImage, pixel_bytes
+from .pipeline import compile_filters
+from .scratch import ScratchPlane
+
+
+class RecipeRenderer:
+    def __init__(self, original: PILImage.Image, max_cache_bytes: int = 512 * 1024 * 1024,
+                 max_spill_bytes: int = 4 * 1024 * 1024 * 1024, scratch_dir: Optional[str] = None):
+        self.original = original
+        self.max_cache_bytes = max_cache_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.scratch_dir = scratch_dir
+        self.checkpoints: 'OrderedDict[tuple, PILImage.Image]' = OrderedDict()
+        self.spilled: 'OrderedDict[tuple, ScratchPlane]' = OrderedDict()
+        self.cache_bytes = 0
+        self.spill_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def held_bytes(self) -> int:
+        return self.cache_bytes + self.spill_bytes
+    
+    def lookup(self, filters: List[Tuple[str, Any]]) -> Optional[PILImage.Image]:
+        key = tuple(filters)
+        if not key:
+            return self.original
+        
+        image = self.checkpoints.get(key)
+        if image is not None:
+            self.checkpoints.move_to_end(key)
+            return image
+        
+        plane = self.spilled.get(key)
+        if plane is not None:
+            self.spilled.move_to_end(key)
+            return plane.image(readonly=True)
+        return None
+    
+    def render(self, filters: List[Tuple[str, Any]]) -> PILImage.Image:
+        key = tuple(filters)
+        start, image = self._nearest_checkpoint(key)
+        if start == len(key):
+            self.hits += 1
+            return image
+        
+        self.misses += 1
+        photon_image = PhotonImage(image)
+        for stage in compile_filters(list(key[start:])):
+            photon_image.apply_stage(stage)
+            self.store(key[:start + len(photon_image.applied_filters)], photon_image.current)
+        return photon_image.current
+    
+    def store(self, filters: List[Tuple[str, Any]], image: PILImage.Image):
+        key = tuple(filters)
+        if not key:
+            return
+        
+        previous = self.checkpoints.pop(key, None)
+        if previous is not None:
+            self.cache_bytes -= pixel_bytes(previous)
+        self._discard_spilled(key)
+        self.checkpoints[key] = image
+        self.cache_bytes += pixel_bytes(image)
+        
+        while self.cache_bytes > self.max_cache_bytes and len(self.checkpoints) > 1:
+            evicted_key, evicted = self.checkpoints.popitem(last=False)
+            self.cache_bytes -= pixel_bytes(evicted)
+            self._spill(evicted_key, evicted)
+    
+    def discard(self, filters: List[Tuple[str, Any]]):
+        key = tuple(filters)
+        image = self.checkpoints.pop(key, None)
+        if image is not None:
+            self.cache_bytes -= pixel_bytes(image)
+        self._discard_spilled(key)
+    
+    def clear(self):
+        self.checkpoints.clear()
+        self.cache_bytes = 0
+        for plane in self.spilled.values():
+            plane.close()
+        self.spilled.clear()
+        self.spill_bytes = 0
+    
+    def _spill(self, key: tuple, image: PILImage.Image):
+        if pixel_bytes(image) > self.max_spill_bytes:
+            return
+        
+        try:
+            plane = ScratchPlane.from_image(image, self.scratch_dir)
+        except (OSError, ValueError):
+            # No scratch space (or an unmappable mode): the checkpoint is dropped and replayed from the recipe instead.
+            return
+        
+        self.spilled[key] = plane
+        self.spill_bytes += plane.nbytes
+        while self.spill_bytes > self.max_spill_bytes and len(self.spilled) > 1:
+            _, evicted = self.spilled.popitem(last=False)
+            self.spill_bytes -= evicted.nbytes
+            evicted.close()
+    
+    def _discard_spilled(self, key: tuple):
+        plane = self.spilled.pop(key, None)
+        if plane is not None:
+            self.spill_bytes -= plane.nbytes
+            plane.close()
+    
+    def _nearest_checkpoint(self, key: tuple) -> Tuple[int, PILImage.Image]:
+        for length in range(len(key), 0, -1):
+            image = self.lookup(key[:length])
+            if image is not None:
+                return length, image
+        return 0, self.original
@@ -0,0 +1,38 @@
+from PIL import Image as PILImage, ImageStat
+from typing import List, Tuple
+
+
+class PixelSampler:
+    def __init__(self, image: PILImage.Image):
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        
+        self.image = image
+        self.size = image.size
+        self.channels = 3
+        # PixelAccess reads straight from the decoded buffer, so a lookup costs the same at any image size.
+        self.pixels = image.load()
+    
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.size[0] and 0 <= y < self.size[1]
+    
+    def sample(self, x: int, y: int) -> Tuple[int, ...]:
+        return self.pixels[x, y][:self.channels]
+    
+    def sample_average(self, x: int, y: int, size: int = 1) -> Tuple[int, ...]:
+        if size <= 1:
+            return self.sample(x, y)
+        
+        stat = ImageStat.Stat(self.image.crop(self._sample_box(x, y, size)))
+        return tuple(round(value) for value in stat.mean[:self.channels])
+    
+    def histogram(self, x: int, y: int, size: int) -> List[List[int]]:
+        values = self.image.crop(self._sample_box(x, y, size)).histogram()
+        return [values[channel * 256:(channel + 1) * 256] for channel in range(self.channels)]
+    
+    def _sample_box(self, x: int, y: int, size: int) -> Tuple[int, int, int, int]:
+        radius = size // 2
+        return (max(0, x - radius), max(0, y - radius),
+                min(self.size[0], x - radius + size), min(self.size[1], y - radius + size))
+
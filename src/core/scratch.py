@@ -0,0 +1,60 @@
+import mmap
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+from PIL import Image as PILImage
+
+
+SCRATCH_DIR = Path.home() / '.photon_snapshot' / 'scratch'
+
+
+def pixel_stride(mode: str, width: int) -> int:
+    if mode in ('1', 'L', 'P'):
+        return width
+    if mode.startswith('I;16'):
+        return width * 2
+    return width * 4
+
+
+class ScratchPlane:
+    # A raw pixel plane in an unlinked temporary file, mapped into memory so the OS can page it out.
+    def __init__(self, mode: str, size: Tuple[int, int], directory: Optional[str] = None):
+        directory = Path(directory) if directory else SCRATCH_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        self.mode = mode
+        self.size = size
+        self.palette = None
+        self.info = {}
+        self.stride = pixel_stride(mode, size[0])
+        self.nbytes = self.stride * size[1]
+        self.file = tempfile.TemporaryFile(prefix='plane-', dir=directory)
+        self.file.truncate(max(1, self.nbytes))
+        self.buffer = mmap.mmap(self.file.fileno(), max(1, self.nbytes))
+        # Pillow's own frombuffer refuses RGB; mapping the core image directly uses its native 4-byte layout.
+        self.core = PILImage.core.map_buffer(self.buffer, size, 'raw', 0, (mode, self.stride, 1))
+    
+    @classmethod
+    def from_image(cls, image: PILImage.Image, directory: Optional[str] = None) -> 'ScratchPlane':
+        plane = cls(image.mode, image.size, directory)
+        plane.image().paste(image)
+        plane.palette = image.getpalette() if image.mode == 'P' else None
+        plane.info = dict(image.info)
+        return plane
+    
+    def image(self, readonly: bool = False) -> PILImage.Image:
+        image = PILImage.new(self.mode, (0, 0))._new(self.core)
+        image.info = dict(self.info)
+        if self.palette:
+            image.putpalette(self.palette)
+        # Read-only images copy themselves before any in-place change, so shared mapped pixels stay intact.
+        image.readonly = int(readonly)
+        return image
+    
+    def close(self):
+        self.core = None
+        try:
+            self.buffer.close()
+        except BufferError:
+            pass
+        self.file.close()
@@ -0,0 +1,166 @@
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from PIL import Image as PILImage, ExifTags, PngImagePlugin
+
+
+def create_thumbnail_image(filepath: str, size: Tuple[int, int]) -> Tuple[PILImage.Image, Tuple[int, int]]:
+    with PILImage.open(filepath) as image:
+        full_size = image.size
+        # Lets the JPEG decoder scale by 1/2, 1/4 or 1/8 during the DCT instead of decoding every pixel.
+        image.draft(None, size)
+        image.load()
+    
+    if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    
+    image.thumbnail(size, PILImage.Resampling.LANCZOS)
+    return image, full_size
+
+
+# Formats without JPEG's scaled decode can still carry a small rendition: a reduced-resolution TIFF page or an EXIF thumbnail.
+def read_embedded_preview(image: PILImage.Image, size: Tuple[int, int]) -> Optional[PILImage.Image]:
+    preview = _reduced_tiff_page(image, size)
+    if preview is None:
+        preview = _exif_thumbnail(image)
+    return preview
+
+
+def _reduced_tiff_page(image: PILImage.Image, size: Tuple[int, int]) -> Optional[PILImage.Image]:
+    if image.format != 'TIFF' or getattr(image, 'n_frames', 1) < 2:
+        return None
+    
+    full_width = image.size[0]
+    best = None
+    try:
+        for frame in range(1, image.n_frames):
+            image.seek(frame)
+            # NewSubfileType bit 0 marks a reduced copy of the main page rather than another page of a document.
+            if not image.tag_v2.get(254, 0) & 1 or image.size[0] >= full_width:
+                continue
+            # The smallest page that still covers the preview size, otherwise the largest there is.
+            covers = max(image.size) >= max(size)
+            key = (covers, -max(image.size) if covers else max(image.size))
+            if best is None or key > best[0]:
+                best = (key, frame)
+        if best is None:
+            return None
+        
+        image.seek(best[1])
+        image.load()
+        return image.copy()
+    except (OSError, EOFError, ValueError):
+        return None
+    finally:
+        image.seek(0)
+
+
+def _exif_thumbnail(image: PILImage.Image) -> Optional[PILImage.Image]:
+    raw = image.info.get('exif')
+    if not raw:
+        return None
+    if raw.startswith(b'Exif\x00\x00'):
+        raw = raw[6:]
+    
+    try:
+        ifd = image.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset, length = ifd[0x0201], ifd[0x0202]
+        thumbnail = PILImage.open(io.BytesIO(raw[offset:offset + length]))
+        thumbnail.load()
+    except (KeyError, OSError, SyntaxError, ValueError):
+        return None
+    return thumbnail
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.photon_snapshot' / 'thumbs'
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: Optional[OrderedDict] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def cache_key(filepath: str, size: Tuple[int, int]) -> str:
+        stat = os.stat(filepath)
+        identity = f"{os.path.abspath(filepath)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[PILImage.Image, Tuple[int, int]]]:
+        path = self._path_for(key)
+        try:
+            with PILImage.open(path) as image:
+                image.load()
+            width, height = image.info['photon_full_size'].split('x')
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        
+        with self._lock:
+            entries = self._get_entries()
+            if key in entries:
+                entries.move_to_end(key)
+        return image, (int(width), int(height))
+    
+    def put(self, key: str, image: PILImage.Image, full_size: Tuple[int, int]):
+        path = self._path_for(key)
+        info = PngImagePlugin.PngInfo()
+        info.add_text('photon_full_size', f"{full_size[0]}x{full_size[1]}")
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            image.save(temp_path, 'PNG', pnginfo=info)
+            os.replace(temp_path, path)
+            file_size = path.stat().st_size
+        except OSError as e:
+            print(f"Failed to cache thumbnail: {e}")
+            return
+        
+        with self._lock:
+            entries = self._get_entries()
+            self.total_bytes += file_size - entries.pop(key, 0)
+            entries[key] = file_size
+            self._evict()
+    
+    def clear(self):
+        with self._lock:
+            entries = self._get_entries()
+            while entries:
+                self._remove_entry(*entries.popitem(last=False))
+    
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+    
+    def _get_entries(self) -> OrderedDict:
+        if self._entries is None:
+            found = []
+            if self.cache_dir.exists():
+                for subdir in os.scandir(self.cache_dir):
+                    if not subdir.is_dir():
+                        continue
+                    for entry in os.scandir(subdir.path):
+                        if entry.name.endswith('.png'):
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+            
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self.total_bytes = sum(self._entries.values())
+        return self._entries
+    
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove_entry(*self._entries.popitem(last=False))
+    
+    def _remove_entry(self, key: str, size: int):
+        self.total_bytes -= size
+        try:
+            self._path_for(key).unlink()
+        except OSError:
+            pass
@@ -0,0 +1,425 @@
+import math
+import struct
+import zlib
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+from PIL import Image as PILImage
+from .image import PhotonImage
+from .pipeline import PointStage, compile_filters, is_point_operation, luma_histogram, run_point_steps, to_point_mode
+from .scratch import ScratchPlane
+
+
+BandTransform = Callable[[PILImage.Image], PILImage.Image]
+
+BAND_OPERATIONS = ('sepia',)
+GEOMETRIC_OPERATIONS = ('crop', 'flip_horizontal', 'flip_vertical', 'resize', 'rotate')
+
+
+@contextmanager
+def _unbounded_pixels():
+    # Large scans trip Pillow's decompression bomb check even though they are never fully held in memory here.
+    limit = PILImage.MAX_IMAGE_PIXELS
+    PILImage.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        PILImage.MAX_IMAGE_PIXELS = limit
+
+
+def should_stream(filepath: str, max_pixels: Optional[int] = None) -> bool:
+    with _unbounded_pixels():
+        with PILImage.open(filepath) as image:
+            width, height = image.size
+    return width * height > (max_pixels or PILImage.MAX_IMAGE_PIXELS)
+
+
+def fit_size(size: Tuple[int, int], target: Tuple[int, int]) -> Tuple[int, int]:
+    width, height = size
+    x, y = target
+    if x >= width and y >= height:
+        return size
+    
+    # Same rounding as Image.thumbnail, so streamed and in-memory resizes agree on the output size.
+    def round_aspect(number: float, key: Callable) -> int:
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+    
+    aspect = width / height
+    if x / y >= aspect:
+        x = round_aspect(y * aspect, key=lambda n: abs(aspect - n / y))
+    else:
+        y = round_aspect(x / aspect, key=lambda n: 0 if n == 0 else abs(aspect - x / n))
+    return x, y
+
+
+# The streaming backend behind batch mode; the viewer and editor still decode whole frames within Pillow's pixel limit.
+class TiledImage:
+    BAND_HEIGHT = 256
+    
+    def __init__(self, source: PILImage.Image, format: str = 'TIFF', planes: Optional[List[ScratchPlane]] = None,
+                 scratch_dir: Optional[str] = None):
+        self.source = source
+        self.format = format
+        self.scratch_dir = scratch_dir
+        self.applied_filters = []
+        self.planes = planes or []
+        self._size = source.size
+    
+    @classmethod
+    def from_file(cls, filepath: str, scratch_dir: Optional[str] = None) -> 'TiledImage':
+        with _unbounded_pixels():
+            image = PILImage.open(filepath)
+        
+        plane = ScratchPlane(image.mode, image.size, scratch_dir)
+        # Decoders write straight into the mapped plane, so the decoded pixels never sit on the heap.
+        image.im = plane.core
+        image.load()
+        source = plane.image()
+        source.info = dict(image.info)
+        format = image.format or 'TIFF'
+        image.close()
+        return cls(source, format, [plane], scratch_dir)
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self._size
+    
+    def apply_filters(self, filters: List[Tuple[str, Any]]):
+        for name, param in filters:
+            self._record(name, param)
+    
+    def apply_brightness(self, factor: float):
+        self._record('brightness', factor)
+    
+    def apply_contrast(self, factor: float):
+        self._record('contrast', factor)
+    
+    def apply_grayscale(self):
+        self._record('grayscale', None)
+    
+    def apply_invert(self):
+        self._record('invert', None)
+    
+    def apply_sepia(self):
+        self._record('sepia', None)
+    
+    def rotate(self, degrees: float):
+        self._record('rotate', degrees)
+    
+    def flip_horizontal(self):
+        self._record('flip_horizontal', None)
+    
+    def flip_vertical(self):
+        self._record('flip_vertical', None)
+    
+    def resize(self, size: Tuple[int, int], keep_aspect: bool = True):
+        self._record('resize', (size, keep_aspect))
+    
+    def crop(self, box: Tuple[int, int, int, int]):
+        self._record('crop', box)
+    
+    def _record(self, name: str, param: Any):
+        width, height = self._size
+        if name == 'rotate':
+            if param % 180:
+                raise ValueError("Streaming rotation only supports multiples of 180 degrees")
+        elif name == 'crop':
+            left, top, right, bottom = param
+            if not (0 <= left < right <= width and 0 <= top < bottom <= height):
+                raise ValueError(f"Crop box {param} is outside the {width}x{height} image")
+            self._size = (right - left, bottom - top)
+        elif name == 'resize':
+            size, keep_aspect = param
+            self._size = fit_size(self._size, size) if keep_aspect else tuple(size)
+        elif name not in BAND_OPERATIONS and name not in GEOMETRIC_OPERATIONS and not is_point_operation(name):
+            raise ValueError(f"Unsupported streaming operation: {name}")
+        self.applied_filters.append((name, param))
+    
+    def bands(self) -> Iterator[Tuple[int, PILImage.Image]]:
+        source = self.source
+        transforms: List[BandTransform] = []
+        
+        for stage in compile_filters(self.applied_filters):
+            if isinstance(stage, PointStage):
+                transforms.append(to_point_mode)
+                mode = self._band_mode(source, transforms)
+                prefix = list(transforms)
+                steps = stage.compile(mode, lambda steps: self._histogram(
+                    source, prefix + [lambda band: run_point_steps(band, steps)]))
+                transforms.append(lambda band, steps=steps: run_point_steps(band, steps))
+                continue
+            
+            name, param = stage
+            if name == 'rotate' and not param % 360:
+                continue
+            if name in BAND_OPERATIONS:
+                transforms.append(lambda band, name=name: self._apply_band_operation(band, name))
+                continue
+            
+            source = self._materialize(self._geometric_size(source.size, name, param),
+                                       self._geometric_bands(source, transforms, name, param))
+            transforms = []
+        
+        yield from self._row_bands(source, transforms, 0, source.size[1])
+    
+    def render(self) -> PILImage.Image:
+        return self._materialize(self._size, self.bands())
+    
+    def save(self, filepath: str, format: str = None, quality: int = 95, compression: str = 'raw'):
+        format = (format or self.format).upper()
+        if format != 'TIFF':
+            bands = self.bands()
+            if format == 'JPEG':
+                bands = ((top, band if band.mode in ('RGB', 'L', 'CMYK') else band.convert('RGB')) for top, band in bands)
+            # Other encoders need the whole frame, so it is assembled in a scratch plane rather than on the heap.
+            self._materialize(self._size, bands).save(filepath, format=format, quality=quality)
+            return
+        
+        writer = None
+        try:
+            for top, band in self.bands():
+                if band.mode not in TiledTiffWriter.PHOTOMETRIC:
+                    band = to_point_mode(band)
+                if writer is None:
+                    writer = TiledTiffWriter(filepath, band.mode, self._size, self.BAND_HEIGHT, compression)
+                writer.write_band(band)
+        finally:
+            if writer:
+                writer.close()
+    
+    def close(self):
+        self.source = None
+        for plane in self.planes:
+            plane.close()
+        self.planes.clear()
+    
+    def _row_bands(self, source: PILImage.Image, transforms: List[BandTransform],
+                   top: int, bottom: int, left: int = 0, right: Optional[int] = None) -> Iterator[Tuple[int, PILImage.Image]]:
+        right = source.size[0] if right is None else right
+        for band_top in range(top, bottom, self.BAND_HEIGHT):
+            band_bottom = min(band_top + self.BAND_HEIGHT, bottom)
+            yield band_top - top, self._read_rows(source, transforms, band_top, band_bottom, left, right)
+    
+    @staticmethod
+    def _read_rows(source: PILImage.Image, transforms: List[BandTransform], top: int, bottom: int,
+                   left: int = 0, right: Optional[int] = None) -> PILImage.Image:
+        band = source.crop((left, top, source.size[0] if right is None else right, bottom))
+        for transform in transforms:
+            band = transform(band)
+        return band
+    
+    def _geometric_bands(self, source: PILImage.Image, transforms: List[BandTransform],
+                         name: str, param: Any) -> Iterator[Tuple[int, PILImage.Image]]:
+        height = source.size[1]
+        
+        if name == 'crop':
+            left, top, right, bottom = param
+            yield from self._row_bands(source, transforms, top, bottom, left, right)
+        elif name == 'flip_horizontal':
+            for top, band in self._row_bands(source, transforms, 0, height):
+                yield top, band.transpose(PILImage.FLIP_LEFT_RIGHT)
+        elif name in ('flip_vertical', 'rotate'):
+            for top in range(0, height, self.BAND_HEIGHT):
+                bottom = min(top + self.BAND_HEIGHT, height)
+                band = self._read_rows(source, transforms, height - bottom, height - top)
+                band = band.transpose(PILImage.FLIP_TOP_BOTTOM)
+                if name == 'rotate':
+                    band = band.transpose(PILImage.FLIP_LEFT_RIGHT)
+                yield top, band
+        elif name == 'resize':
+            yield from self._resize_bands(source, transforms, *param)
+    
+    def _resize_bands(self, source: PILImage.Image, transforms: List[BandTransform],
+                      size: Tuple[int, int], keep_aspect: bool) -> Iterator[Tuple[int, PILImage.Image]]:
+        width, height = source.size
+        out_width, out_height = fit_size(source.size, size) if keep_aspect else size
+        if (out_width, out_height) == source.size:
+            yield from self._row_bands(source, transforms, 0, height)
+            return
+        
+        mode = self._band_mode(source, transforms)
+        box_width, box_height = width, height
+        # Image.thumbnail pre-shrinks with reduce() (reducing_gap=2.0) except where resize() falls back to other paths.
+        if keep_aspect and mode not in ('1', 'P', 'LA', 'RGBA'):
+            factor = (int(width / out_width / 2.0) or 1, int(height / out_height / 2.0) or 1)
+            if factor != (1, 1):
+                reduced_size = (math.ceil(width / factor[0]), math.ceil(height / factor[1]))
+                source = self._materialize(reduced_size, self._reduce_bands(source, transforms, factor))
+                transforms = []
+                box_width, box_height = width / factor[0], height / factor[1]
+                width, height = source.size
+        
+        # resize() filters LA and RGBA with premultiplied alpha and palette images with NEAREST.
+        resample = PILImage.Resampling.NEAREST if mode == 'P' else PILImage.Resampling.LANCZOS
+        premultiplied = {'LA': 'La', 'RGBA': 'RGBa'}.get(mode)
+        if premultiplied:
+            transforms = transforms + [lambda band: band.convert(premultiplied)]
+        
+        # Every row of a horizontal pass is filtered on its own, so bands match a full-frame resize exactly; the vertical
+        # pass runs the same way over a transposed scratch plane. Very tall images are filtered vertically first, as in
+        # resize().
+        bands = self._row_bands(source, transforms, 0, height)
+        if height > width * 100 and out_height < height:
+            bands = self._vertical_pass(bands, (width, height), out_height, box_height, resample)
+            bands = self._horizontal_pass(bands, out_width, box_width, resample)
+        else:
+            bands = self._horizontal_pass(bands, out_width, box_width, resample)
+            bands = self._vertical_pass(bands, (out_width, height), out_height, box_height, resample)
+        
+        for top, band in bands:
+            yield top, band.convert(mode) if premultiplied else band
+    
+    @staticmethod
+    def _horizontal_pass(bands: Iterator[Tuple[int, PILImage.Image]], out_width: int, box_width: float,
+                         resample: int) -> Iterator[Tuple[int, PILImage.Image]]:
+        for top, band in bands:
+            yield top, band.resize((out_width, band.size[1]), resample, box=(0, 0, box_width, band.size[1]))
+    
+    def _vertical_pass(self, bands: Iterator[Tuple[int, PILImage.Image]], size: Tuple[int, int], out_height: int,
+                       box_height: float, resample: int) -> Iterator[Tuple[int, PILImage.Image]]:
+        width, height = size
+        columns = self._materialize((height, width), bands, transpose=True)
+        columns = self._horizontal_pass(self._row_bands(columns, [], 0, width), out_height, box_height, resample)
+        result = self._materialize((width, out_height), columns, transpose=True)
+        yield from self._row_bands(result, [], 0, out_height)
+    
+    def _reduce_bands(self, source: PILImage.Image, transforms: List[BandTransform],
+                      factor: Tuple[int, int]) -> Iterator[Tuple[int, PILImage.Image]]:
+        height = source.size[1]
+        step = max(1, self.BAND_HEIGHT // factor[1]) * factor[1]
+        for top in range(0, height, step):
+            band = self._read_rows(source, transforms, top, min(top + step, height))
+            yield top // factor[1], band.reduce(factor)
+    
+    def _materialize(self, size: Tuple[int, int], bands: Iterator[Tuple[int, PILImage.Image]],
+                     transpose: bool = False) -> PILImage.Image:
+        target = None
+        for top, band in bands:
+            if transpose:
+                band = band.transpose(PILImage.Transpose.TRANSPOSE)
+            if target is None:
+                plane = ScratchPlane(band.mode, size, self.scratch_dir)
+                self.planes.append(plane)
+                target = plane.image()
+                target.info = dict(band.info)
+                if band.mode == 'P':
+                    target.putpalette(band.getpalette())
+            target.paste(band, (top, 0) if transpose else (0, top))
+        return target
+    
+    @staticmethod
+    def _geometric_size(size: Tuple[int, int], name: str, param: Any) -> Tuple[int, int]:
+        if name == 'crop':
+            left, top, right, bottom = param
+            return right - left, bottom - top
+        if name == 'resize':
+            target, keep_aspect = param
+            return fit_size(size, target) if keep_aspect else tuple(target)
+        return size
+    
+    def _histogram(self, source: PILImage.Image, transforms: List[BandTransform]) -> List[int]:
+        total = None
+        for _, band in self._row_bands(source, transforms, 0, source.size[1]):
+            histogram = luma_histogram(band)
+            total = histogram if total is None else [a + b for a, b in zip(total, histogram)]
+        return total
+    
+    def _band_mode(self, source: PILImage.Image, transforms: List[BandTransform]) -> str:
+        return self._read_rows(source, transforms, 0, 1, 0, 1).mode
+    
+    @staticmethod
+    def _apply_band_operation(band: PILImage.Image, name: str) -> PILImage.Image:
+        image = PhotonImage(band)
+        getattr(image, f"apply_{name}")()
+        return image.current
+
+
+class TiledTiffWriter:
+    PHOTOMETRIC = {'L': 1, 'LA': 1, 'RGB': 2, 'RGBA': 2}
+    CLASSIC_LIMIT = 2 ** 32 - 2 ** 24
+    
+    def __init__(self, filepath: str, mode: str, size: Tuple[int, int], tile_size: int = 256, compression: str = 'raw'):
+        if mode not in self.PHOTOMETRIC:
+            raise ValueError(f"Cannot write mode {mode} as a tiled TIFF")
+        if compression not in ('raw', 'deflate'):
+            raise ValueError(f"Unsupported TIFF compression: {compression}")
+        
+        self.mode = mode
+        self.size = size
+        self.tile_size = tile_size
+        self.compression = compression
+        self.samples = len(mode)
+        self.offsets: List[int] = []
+        self.byte_counts: List[int] = []
+        
+        width, height = size
+        tiles = math.ceil(width / tile_size) * math.ceil(height / tile_size)
+        self.big = tiles * tile_size * tile_size * self.samples >= self.CLASSIC_LIMIT
+        
+        self.file: BinaryIO = open(filepath, 'wb')
+        if self.big:
+            self.file.write(b'II' + struct.pack('<HHHQ', 43, 8, 0, 0))
+        else:
+            self.file.write(b'II' + struct.pack('<HI', 42, 0))
+    
+    def write_band(self, band: PILImage.Image):
+        width, height = band.size
+        for left in range(0, width, self.tile_size):
+            tile = band.crop((left, 0, left + self.tile_size, self.tile_size))
+            data = tile.tobytes()
+            if self.compression == 'deflate':
+                data = zlib.compress(data, 6)
+            self.offsets.append(self.file.tell())
+            self.byte_counts.append(len(data))
+            self.file.write(data)
+    
+    def close(self):
+        width, height = self.size
+        long_type = 16 if self.big else 4
+        entries = [
+            (256, 4, [width]),
+            (257, 4, [height]),
+            (258, 3, [8] * self.samples),
+            (259, 3, [8 if self.compression == 'deflate' else 1]),
+            (262, 3, [self.PHOTOMETRIC[self.mode]]),
+            (277, 3, [self.samples]),
+            (284, 3, [1]),
+            (322, 4, [self.tile_size]),
+            (323, 4, [self.tile_size]),
+            (324, long_type, self.offsets),
+            (325, long_type, self.byte_counts),
+        ]
+        if self.mode in ('LA', 'RGBA'):
+            entries.append((338, 3, [2]))
+        
+        inline_size = 8 if self.big else 4
+        packed = []
+        for tag, field_type, values in entries:
+            data = struct.pack('<' + {3: 'H', 4: 'I', 16: 'Q'}[field_type] * len(values), *values)
+            if len(data) > inline_size:
+                self._align()
+                offset = self.file.tell()
+                self.file.write(data)
+                data = struct.pack('<Q' if self.big else '<I', offset)
+            packed.append((tag, field_type, len(values), data.ljust(inline_size, b'\0')))
+        
+        self._align()
+        ifd_offset = self.file.tell()
+        if self.big:
+            self.file.write(struct.pack('<Q', len(packed)))
+            for tag, field_type, count, data in packed:
+                self.file.write(struct.pack('<HHQ', tag, field_type, count) + data)
+            self.file.write(struct.pack('<Q', 0))
+            self.file.seek(8)
+            self.file.write(struct.pack('<Q', ifd_offset))
+        else:
+            self.file.write(struct.pack('<H', len(packed)))
+            for tag, field_type, count, data in packed:
+                self.file.write(struct.pack('<HHI', tag, field_type, count) + data)
+            self.file.write(struct.pack('<I', 0))
+            self.file.seek(4)
+            self.file.write(struct.pack('<I', ifd_offset))
+        self.file.close()
+    
+    def _align(self):
+        if self.file.tell() % 2:
+            self.file.write(b'\0')
@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
                              QSlider, QLabel, QPushButton, QSpinBox, QComboBox,
                              QFrame, QSizePolicy, QButtonGroup, QCheckBox)
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont
 from core.editor import Editor
 from .overlay_panel import OverlayPanel
@@ -9,6 +9,7 @@ from .overlay_panel import OverlayPanel
 
 class SliderGroup(QWidget):
     value_changed = Signal(float)
+    value_committed = Signal(float)
     
     def __init__(self, title: str, min_val: float = 0.0, max_val: float = 2.0, 
                  default_val: float = 1.0, decimals: int = 2):
@@ -31,6 +32,12 @@ class SliderGroup(QWidget):
         self.slider.setMaximum(int(max_val * self.multiplier))
         self.slider.setValue(int(default_val * self.multiplier))
         self.slider.valueChanged.connect(self._on_slider_changed)
+        self.slider.sliderReleased.connect(self._commit_value)
+        
+        self.commit_timer = QTimer(self)
+        self.commit_timer.setSingleShot(True)
+        self.commit_timer.setInterval(400)
+        self.commit_timer.timeout.connect(self._commit_value)
         
         self.value_label = QLabel(f"{default_val:.{decimals}f}")
         self.value_label.setMinimumWidth(50)
@@ -66,14 +73,31 @@ class SliderGroup(QWidget):
         real_value = value / self.multiplier
         self.value_label.setText(f"{real_value:.{self.decimals}f}")
         self.value_changed.emit(real_value)
+        
+        # Keyboard and wheel changes have no release event, so commit once they settle.
+        if not self.slider.isSliderDown():
+            self.commit_timer.start()
+    
+    def _commit_value(self):
+        self.commit_timer.stop()
+        self.value_committed.emit(self.value())
+    
+    def value(self) -> float:
+        return self.slider.value() / self.multiplier
     
     def set_value(self, value: float):
+        self.commit_timer.stop()
+        self.slider.blockSignals(True)
         self.slider.setValue(int(value * self.multiplier))
+        self.slider.blockSignals(False)
+        self.value_label.setText(f"{value:.{self.decimals}f}")
 
 
 class EffectsPanel(QGroupBox):
     brightness_changed = Signal(float)
+    brightness_committed = Signal(float)
     contrast_changed = Signal(float)
+    contrast_committed = Signal(float)
     grayscale_applied = Signal()
     sepia_applied = Signal()
     invert_applied = Signal()
@@ -102,6 +126,8 @@ class EffectsPanel(QGroupBox):
         
         self.brightness_slider.value_changed.connect(self.brightness_changed.emit)
         self.contrast_slider.value_changed.connect(self.contrast_changed.emit)
+        self.brightness_slider.value_committed.connect(self.brightness_committed.emit)
+        self.contrast_slider.value_committed.connect(self.contrast_committed.emit)
         
         effects_layout = QHBoxLayout()
         
@@ -293,9 +319,19 @@ class CropPanel(QGroupBox):
 
 
 class EditorPanel(QWidget):
+    preview_changed = Signal(object)
+    preview_cancelled = Signal()
+    
     def __init__(self, editor: Editor):
         super().__init__()
         self.editor = editor
+        self.pending_preview_level = 1.0
+        
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(30)
+        self.preview_timer.timeout.connect(self._render_preview)
+        
         self.setup_ui()
         self.connect_signals()
     
@@ -324,8 +360,10 @@ class EditorPanel(QWidget):
         self.setLayout(layout)
     
     def connect_signals(self):
-        self.effects_panel.brightness_changed.connect(self.editor.apply_brightness)
-        self.effects_panel.contrast_changed.connect(self.editor.apply_contrast)
+        self.effects_panel.brightness_changed.connect(lambda value: self._preview_adjustment('brightness', value))
+        self.effects_panel.brightness_committed.connect(lambda value: self._commit_adjustment('brightness', value))
+        self.effects_panel.contrast_changed.connect(lambda value: self._preview_adjustment('contrast', value))
+        self.effects_panel.contrast_committed.connect(lambda value: self._commit_adjustment('contrast', value))
         self.effects_panel.grayscale_applied.connect(self.editor.apply_grayscale)
         self.effects_panel.sepia_applied.connect(self.editor.apply_sepia)
         self.effects_panel.invert_applied.connect(self.editor.apply_invert)
@@ -335,6 +373,46 @@ class EditorPanel(QWidget):
         self.transform_panel.flip_horizontal.connect(self.editor.flip_horizontal)
         self.transform_panel.flip_vertical.connect(self.editor.flip_vertical)
     
+    # Slider positions mirror the recipe, so undo, redo and reset move them back along with the pixels.
+    def sync_adjustments(self):
+        for adjustment in ('brightness', 'contrast'):
+            slider = self._get_adjustment_slider(adjustment)
+            if not slider.slider.isSliderDown():
+                slider.set_value(self.editor.get_adjustment_level(adjustment))
+    
+    def _preview_adjustment(self, adjustment: str, value: float):
+        session = self.editor.preview_session
+        if not session or session.adjustment != adjustment:
+            if session:
+                self._commit_adjustment(session.adjustment, self._get_adjustment_slider(session.adjustment).value())
+            if not self.editor.begin_preview(adjustment):
+                return
+        
+        self.pending_preview_level = value
+        if not self.preview_timer.isActive():
+            self.preview_timer.start()
+    
+    def _render_preview(self):
+        preview = self.editor.update_preview(self.pending_preview_level)
+        if preview is not None:
+            self.preview_changed.emit(preview)
+    
+    def _commit_adjustment(self, adjustment: str, value: float):
+        session = self.editor.preview_session
+        if not session or session.adjustment != adjustment:
+            return
+        
+        self.preview_timer.stop()
+        if not self.editor.commit_preview(value):
+            self.preview_cancelled.emit()
+    
+    def _get_adjustment_slider(self, adjustment: str) -> SliderGroup:
+        if adjustment == 'brightness':
+            return self.effects_panel.brightness_slider
+        return self.effects_panel.contrast_slider
+    
     def reset_controls(self):
+        self.preview_timer.stop()
+        self.editor.cancel_preview()
         self.effects_panel.reset_sliders()
         self.crop_panel.crop_mode_checkbox.setChecked(False)
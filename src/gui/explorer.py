@@ -1,117 +1,258 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
-                             QListWidgetItem, QLabel, QFrame, QPushButton, 
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, 
+                             QLabel, QFrame, QPushButton, 
                              QLineEdit, QSplitter, QScrollArea, QSizePolicy, QMenu)
 from PySide6.QtCore import Qt, Signal, QSize, QTimer
 from PySide6.QtGui import QPixmap, QIcon, QFont, QAction
 from PySide6.QtWidgets import QApplication
-from core.explorer import FileExplorer
-from core.utils import create_thumbnail, is_image_file, get_file_size_str
-from core.image import PhotonImage
+from core.listing import DirectoryListing
+from core.qt.explorer import FileExplorer
+from core.qt.listing_model import DirectoryListModel, FULL_PATH_ROLE, IS_DIRECTORY_ROLE, IS_IMAGE_ROLE
+from core.qt.convert import pil_to_qpixmap
+from core.qt.thumbnails import ThumbnailService
+from core.qt.watcher import DirectoryWatcher
+from core.thumbnails import ThumbnailCache
+from core.utils import is_image_file, get_file_size_str
 import os
 from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
 
 
-class FileListWidget(QListWidget):
+class FileListWidget(QListView):
     file_selected = Signal(str)
     directory_entered = Signal(str)
     open_image = Signal(str)
     
-    def __init__(self):
+    GRID_ICON_SIZE = 128
+    
+    def __init__(self, thumbnail_service: Optional[ThumbnailService] = None):
         super().__init__()
+        self.thumbnail_service = thumbnail_service
+        self.grid_mode = False
+        self.requested_thumbnails: Set[str] = set()
+        self.failed_thumbnails: Dict[str, Tuple[int, int]] = {}
+        self.scroll_direction = 1
+        self.last_scroll_value = 0
+        
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(30)
+        self.thumbnail_timer.timeout.connect(self._request_visible_thumbnails)
+        
         self.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #2b2b2b;
                 border: none;
                 color: #ffffff;
                 selection-background-color: #0078d4;
                 outline: none;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 6px 8px;
                 border: none;
                 min-height: 20px;
                 border-radius: 3px;
                 margin: 1px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #0078d4;
                 color: #ffffff;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #404040;
             }
-            QListWidget::item:selected:hover {
+            QListView::item:selected:hover {
                 background-color: #106ebe;
             }
         """)
         
+        self.list_model = DirectoryListModel(self)
+        self.setModel(self.list_model)
+        # Every row has the same height, so the view can place rows without measuring them and only paints what is visible.
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        
         self.setIconSize(QSize(16, 16))
-        self.itemClicked.connect(self._on_item_clicked)
-        self.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.clicked.connect(self._on_item_clicked)
+        self.doubleClicked.connect(self._on_item_double_clicked)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
+        
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.list_model.rowsInserted.connect(self._schedule_thumbnails)
+        self.list_model.modelReset.connect(self._schedule_thumbnails)
+        if self.thumbnail_service:
+            self.thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
+            self.thumbnail_service.thumbnail_failed.connect(self._on_thumbnail_failed)
     
-    def _get_file_icon(self, is_directory: bool, is_image: bool, file_name: str = "") -> QIcon:
-        style = self.style()
+    def set_listing(self, listing: DirectoryListing):
+        self._cancel_thumbnails()
+        self.failed_thumbnails.clear()
+        self.list_model.set_listing(listing)
+        self.scrollToTop()
+    
+    def update_listing(self, listing: DirectoryListing):
+        diff = self.list_model.update_listing(listing)
+        if diff:
+            # New or rewritten files get another attempt; a capture still being written fails the first time round.
+            directory = self.list_model.listing.path
+            names = [row[0] for row in diff.added + diff.changed]
+            for name, flags, row in diff.renamed:
+                names += [name, row[0]]
+            for name in names:
+                self.failed_thumbnails.pop(os.path.join(directory, name), None)
+        self._schedule_thumbnails()
+    
+    def set_grid_mode(self, enabled: bool):
+        self.grid_mode = enabled and self.thumbnail_service is not None
+        if self.grid_mode:
+            size = self.GRID_ICON_SIZE
+            self.setViewMode(QListView.IconMode)
+            self.setIconSize(QSize(size, size))
+            self.setGridSize(QSize(size + 24, size + 36))
+            self.setResizeMode(QListView.Adjust)
+            self.setMovement(QListView.Static)
+            self.setWordWrap(True)
+        else:
+            self.setViewMode(QListView.ListMode)
+            self.setIconSize(QSize(16, 16))
+            self.setGridSize(QSize())
+            self.setWordWrap(False)
+            self._cancel_thumbnails()
+        
+        self.list_model.set_thumbnails_visible(self.grid_mode)
+        self._schedule_thumbnails()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_thumbnails()
+    
+    def _on_scrolled(self, value: int):
+        if value != self.last_scroll_value:
+            self.scroll_direction = 1 if value > self.last_scroll_value else -1
+            self.last_scroll_value = value
+        self._schedule_thumbnails()
+    
+    # Scrolling fires many times per frame; requests are recomputed once things settle for a moment.
+    def _schedule_thumbnails(self, *args):
+        if self.grid_mode:
+            self.thumbnail_timer.start()
+    
+    # Items in the grid are uniform and static, so the visible range follows directly from the scroll offset.
+    def _visible_rows(self) -> Tuple[int, int]:
+        rows = self.list_model.rowCount()
+        if not rows:
+            return 0, -1
+        
+        grid = self.gridSize()
+        viewport = self.viewport().rect()
+        columns = max(1, viewport.width() // max(1, grid.width()))
+        top = self.verticalScrollBar().value()
+        first_line = top // max(1, grid.height())
+        last_line = (top + viewport.height()) // max(1, grid.height())
+        return min(rows - 1, first_line * columns), min(rows - 1, (last_line + 1) * columns - 1)
+    
+    # Visible rows load first, top to bottom, then one more screen in the direction the user is scrolling.
+    # Anything requested earlier that is no longer wanted is cancelled before it reaches a worker.
+    def _request_visible_thumbnails(self):
+        if not self.grid_mode or not self.isVisible():
+            return
         
-        if is_directory:
-            return style.standardIcon(style.StandardPixmap.SP_DirIcon)
-        elif is_image:
-            return style.standardIcon(style.StandardPixmap.SP_DesktopIcon)
+        model = self.list_model
+        first, last = self._visible_rows()
+        span = last - first + 1
+        if self.scroll_direction >= 0:
+            ahead = range(last + 1, min(model.rowCount(), last + 1 + span))
         else:
-            file_ext = os.path.splitext(file_name)[1].lower()
-            if file_ext in ['.txt', '.md', '.log', '.py', '.js', '.html', '.css']:
-                return style.standardIcon(style.StandardPixmap.SP_FileDialogDetailedView)
-            elif file_ext in ['.exe', '.msi', '.app']:
-                return style.standardIcon(style.StandardPixmap.SP_ComputerIcon)
-            elif file_ext in ['.zip', '.rar', '.7z', '.tar', '.gz']:
-                return style.standardIcon(style.StandardPixmap.SP_DriveHDIcon)
-            else:
-                return style.standardIcon(style.StandardPixmap.SP_FileIcon)
+            ahead = range(first - 1, max(-1, first - 1 - span), -1)
+        
+        wanted = []
+        for row in list(range(first, last + 1)) + list(ahead):
+            if not model.listing.is_image(row):
+                continue
+            name = model.listing.names[row]
+            path = model.listing.full_path(row)
+            if not model.has_thumbnail(name) and not self._failed_unchanged(path):
+                wanted.append(path)
+        
+        for path in self.requested_thumbnails.difference(wanted):
+            self.thumbnail_service.cancel(path)
+        for priority, path in enumerate(wanted):
+            self.thumbnail_service.request(path, priority)
+        self.requested_thumbnails = set(wanted)
+    
+    def _cancel_thumbnails(self):
+        if self.thumbnail_service:
+            for path in self.requested_thumbnails:
+                self.thumbnail_service.cancel(path)
+        self.requested_thumbnails.clear()
     
-    def _on_item_clicked(self, item):
-        data = item.data(Qt.UserRole)
-        if data and data['is_image']:
-            self.file_selected.emit(data['full_path'])
+    def _on_thumbnail_ready(self, filepath: str, image, full_size):
+        self.requested_thumbnails.discard(filepath)
+        self.failed_thumbnails.pop(filepath, None)
+        directory, name = os.path.split(filepath)
+        if self.grid_mode and directory == self.list_model.listing.path:
+            self.list_model.set_thumbnail(name, pil_to_qpixmap(image))
     
-    def _on_item_double_clicked(self, item):
-        data = item.data(Qt.UserRole)
-        if data:
-            if data['is_directory']:
-                self.directory_entered.emit(data['full_path'])
-            elif data['is_image']:
-                self.open_image.emit(data['full_path'])
+    def _on_thumbnail_failed(self, filepath: str):
+        self.requested_thumbnails.discard(filepath)
+        self.failed_thumbnails[filepath] = self._file_stamp(filepath)
+    
+    # Failures are remembered against the file's size and date, so a file that changes afterwards is tried again.
+    def _failed_unchanged(self, filepath: str) -> bool:
+        stamp = self.failed_thumbnails.get(filepath)
+        return stamp is not None and stamp == self._file_stamp(filepath)
+    
+    @staticmethod
+    def _file_stamp(filepath: str) -> Tuple[int, int]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return 0, 0
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _on_item_clicked(self, index):
+        if index.data(IS_IMAGE_ROLE):
+            self.file_selected.emit(index.data(FULL_PATH_ROLE))
+    
+    def _on_item_double_clicked(self, index):
+        if index.data(IS_DIRECTORY_ROLE):
+            self.directory_entered.emit(index.data(FULL_PATH_ROLE))
+        elif index.data(IS_IMAGE_ROLE):
+            self.open_image.emit(index.data(FULL_PATH_ROLE))
     
     def _show_context_menu(self, position):
-        item = self.itemAt(position)
-        if item:
-            data = item.data(Qt.UserRole)
-            if data and data['is_image']:
-                menu = QMenu(self)
-                menu.setStyleSheet("""
-                    QMenu {
-                        background-color: #2b2b2b;
-                        color: #ffffff;
-                        border: 1px solid #404040;
-                    }
-                    QMenu::item {
-                        padding: 5px 20px;
-                    }
-                    QMenu::item:selected {
-                        background-color: #0078d4;
-                    }
-                """)
-                
-                open_action = QAction("Open Image", self)
-                open_action.triggered.connect(lambda: self.open_image.emit(data['full_path']))
-                menu.addAction(open_action)
-                
-                menu.exec_(self.mapToGlobal(position))
+        index = self.indexAt(position)
+        if index.isValid() and index.data(IS_IMAGE_ROLE):
+            full_path = index.data(FULL_PATH_ROLE)
+            menu = QMenu(self)
+            menu.setStyleSheet("""
+                QMenu {
+                    background-color: #2b2b2b;
+                    color: #ffffff;
+                    border: 1px solid #404040;
+                }
+                QMenu::item {
+                    padding: 5px 20px;
+                }
+                QMenu::item:selected {
+                    background-color: #0078d4;
+                }
+            """)
+            
+            open_action = QAction("Open Image", self)
+            open_action.triggered.connect(lambda: self.open_image.emit(full_path))
+            menu.addAction(open_action)
+            
+            menu.exec_(self.mapToGlobal(position))
 
 
 class PreviewPane(QFrame):
-    def __init__(self):
+    def __init__(self, thumbnail_service: ThumbnailService):
         super().__init__()
+        self.thumbnail_service = thumbnail_service
+        self.thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.thumbnail_service.thumbnail_failed.connect(self._on_thumbnail_failed)
         self.setFixedWidth(200)
         self.setStyleSheet("""
             QFrame {
@@ -153,24 +294,38 @@ class PreviewPane(QFrame):
         self.current_file = None
     
     def set_preview(self, filepath: str):
+        if self.current_file and self.current_file != filepath:
+            self.thumbnail_service.cancel(self.current_file)
+        
         self.current_file = filepath
         try:
             if is_image_file(filepath):
-                image = PhotonImage.from_file(filepath)
-                thumbnail = create_thumbnail(image.current, (160, 160))
-                self.preview_label.setPixmap(thumbnail)
-                
                 file_size = os.path.getsize(filepath)
-                width, height = image.size
                 
+                self.preview_label.clear()
+                self.preview_label.setText("Loading...")
                 self.name_label.setText(os.path.basename(filepath))
                 self.size_label.setText(get_file_size_str(file_size))
-                self.dimensions_label.setText(f"{width} × {height}")
+                self.dimensions_label.clear()
+                
+                self.thumbnail_service.request(filepath)
             else:
                 self.clear_preview()
         except Exception:
             self.clear_preview()
     
+    def _on_thumbnail_ready(self, filepath: str, image, full_size):
+        if filepath != self.current_file:
+            return
+        
+        width, height = full_size
+        self.preview_label.setPixmap(pil_to_qpixmap(image))
+        self.dimensions_label.setText(f"{width} × {height}")
+    
+    def _on_thumbnail_failed(self, filepath: str):
+        if filepath == self.current_file:
+            self.clear_preview()
+    
     def clear_preview(self):
         self.preview_label.clear()
         self.preview_label.setText("No preview")
@@ -215,6 +370,7 @@ class NavigationBar(QWidget):
     back_clicked = Signal()
     forward_clicked = Signal()
     up_clicked = Signal()
+    grid_toggled = Signal(bool)
     
     def __init__(self):
         super().__init__()
@@ -241,7 +397,14 @@ class NavigationBar(QWidget):
         self.up_btn.setFixedSize(30, 30)
         self.up_btn.clicked.connect(self.up_clicked.emit)
         
-        for btn in [self.back_btn, self.forward_btn, self.up_btn]:
+        self.grid_btn = QPushButton()
+        self.grid_btn.setIcon(style.standardIcon(style.StandardPixmap.SP_FileDialogContentsView))
+        self.grid_btn.setToolTip("Thumbnail Grid")
+        self.grid_btn.setCheckable(True)
+        self.grid_btn.setFixedSize(30, 30)
+        self.grid_btn.toggled.connect(self.grid_toggled.emit)
+        
+        for btn in [self.back_btn, self.forward_btn, self.up_btn, self.grid_btn]:
             btn.setStyleSheet("""
                 QPushButton {
                     background-color: #404040;
@@ -256,6 +419,9 @@ class NavigationBar(QWidget):
                 QPushButton:pressed {
                     background-color: #303030;
                 }
+                QPushButton:checked {
+                    background-color: #0078d4;
+                }
                 QPushButton:disabled {
                     background-color: #2b2b2b;
                     color: #666666;
@@ -266,6 +432,7 @@ class NavigationBar(QWidget):
         layout.addWidget(self.forward_btn)
         layout.addWidget(self.up_btn)
         layout.addStretch()
+        layout.addWidget(self.grid_btn)
         
         self.setLayout(layout)
     
@@ -281,6 +448,12 @@ class ExplorerWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.explorer = FileExplorer()
+        # Both services write into the same directory, so they share one cache and one byte budget.
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_service = ThumbnailService((160, 160), self.thumbnail_cache)
+        self.grid_thumbnail_service = ThumbnailService((FileListWidget.GRID_ICON_SIZE, FileListWidget.GRID_ICON_SIZE),
+                                                       self.thumbnail_cache)
+        self.watcher = DirectoryWatcher(self.explorer.listing_cache)
         self.setup_ui()
         self.connect_signals()
         self.refresh_view()
@@ -295,8 +468,8 @@ class ExplorerWidget(QWidget):
         
         content_splitter = QSplitter(Qt.Horizontal)
         
-        self.file_list = FileListWidget()
-        self.preview_pane = PreviewPane()
+        self.file_list = FileListWidget(self.grid_thumbnail_service)
+        self.preview_pane = PreviewPane(self.thumbnail_service)
         
         content_splitter.addWidget(self.file_list)
         content_splitter.addWidget(self.preview_pane)
@@ -310,9 +483,11 @@ class ExplorerWidget(QWidget):
     
     def connect_signals(self):
         self.explorer.path_changed.connect(self._on_path_changed)
+        self.watcher.directory_changed.connect(self._on_directory_changed)
         self.nav_bar.back_clicked.connect(self.explorer.go_back)
         self.nav_bar.forward_clicked.connect(self.explorer.go_forward)
         self.nav_bar.up_clicked.connect(self.explorer.go_up)
+        self.nav_bar.grid_toggled.connect(self.file_list.set_grid_mode)
         self.path_bar.path_changed.connect(self.explorer.navigate_to)
         self.file_list.directory_entered.connect(self.explorer.navigate_to)
         self.file_list.file_selected.connect(self._on_file_selected)
@@ -326,49 +501,38 @@ class ExplorerWidget(QWidget):
         )
         self.refresh_view()
     
+    def _on_directory_changed(self, path: str, listing: DirectoryListing):
+        if os.path.abspath(self.explorer.current_path) == path:
+            self.file_list.update_listing(listing)
+    
     def _on_file_selected(self, filepath: str):
         self.preview_pane.set_preview(filepath)
         self.file_selected.emit(filepath)
     
+    def select_file(self, filepath: str):
+        directory, name = os.path.split(os.path.abspath(filepath))
+        if directory != self.file_list.list_model.listing.path:
+            return
+        index = self.file_list.list_model.index_for_name(name)
+        if index.isValid():
+            self.file_list.setCurrentIndex(index)
+            self.file_list.scrollTo(index)
+    
     def refresh_view(self):
-        self.file_list.clear()
-        files = self.explorer.get_all_files()
-        
-        for name, is_dir, is_image, full_path in files:
-            item = QListWidgetItem()
-            
-            item.setText(name)
-            
-            icon = self.file_list._get_file_icon(is_dir, is_image, name)
-            item.setIcon(icon)
-            
-            item.setData(Qt.UserRole, {
-                'name': name,
-                'is_directory': is_dir,
-                'is_image': is_image,
-                'full_path': full_path
-            })
-            
-            if is_dir:
-                font = item.font()
-                font.setBold(True)
-                item.setFont(font)
-                item.setForeground(Qt.GlobalColor.yellow)
-            elif is_image:
-                item.setForeground(Qt.GlobalColor.green)
-            else:
-                item.setForeground(Qt.GlobalColor.lightGray)
-            
-            self.file_list.addItem(item)
+        listing = self.explorer.list_directory()
+        self.file_list.set_listing(listing)
+        self.watcher.watch(self.explorer.current_path)
+    
+    def shutdown(self):
+        self.thumbnail_service.shutdown()
+        self.grid_thumbnail_service.shutdown()
     
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Backspace:
             self.explorer.go_back()
         elif event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
-            current_item = self.file_list.currentItem()
-            if current_item:
-                data = current_item.data(Qt.UserRole)
-                if data and data['is_directory']:
-                    self.explorer.navigate_to(data['full_path'])
+            index = self.file_list.currentIndex()
+            if index.isValid() and index.data(IS_DIRECTORY_ROLE):
+                self.explorer.navigate_to(index.data(FULL_PATH_ROLE))
         else:
             super().keyPressEvent(event)
\ No newline at end of file
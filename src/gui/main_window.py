@@ -3,7 +3,7 @@ import app_guard
 
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QSplitter, QMenuBar, QToolBar, QStatusBar, QLabel,
-                             QMessageBox, QFileDialog, QApplication)
+                             QMessageBox, QFileDialog, QApplication, QProgressBar)
 from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QAction, QKeySequence, QIcon, QPixmap
 from .viewer import ImageViewer
@@ -11,7 +11,9 @@ from .explorer import ExplorerWidget
 from .editor_panel import EditorPanel
 from core.editor import Editor
 from core.image import PhotonImage
-from core.utils import get_all_image_filter, get_save_formats
+from core.qt.loader import ImageLoader
+from core.prefetch import ImagePrefetcher
+from core.utils import get_all_image_filter, get_save_formats, get_file_size_str
 
 
 
@@ -21,6 +23,10 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.editor = Editor()
+        self.prefetcher = ImagePrefetcher()
+        self.image_loader = ImageLoader(prefetcher=self.prefetcher)
+        self.prefetch_radius = 2
+        self.step_direction = 1
         self.current_file_path = None
         self.recent_files_actions = []
         
@@ -187,6 +193,18 @@ class MainWindow(QMainWindow):
         
         view_menu.addSeparator()
         
+        self.next_image_action = QAction("Next Image", self)
+        self.next_image_action.setShortcut(QKeySequence("N"))
+        self.next_image_action.triggered.connect(self.next_image)
+        view_menu.addAction(self.next_image_action)
+        
+        self.previous_image_action = QAction("Previous Image", self)
+        self.previous_image_action.setShortcut(QKeySequence("P"))
+        self.previous_image_action.triggered.connect(self.previous_image)
+        view_menu.addAction(self.previous_image_action)
+        
+        view_menu.addSeparator()
+        
         self.toggle_explorer_action = QAction("Toggle Explorer", self)
         self.toggle_explorer_action.setShortcut(QKeySequence("F9"))
         self.toggle_explorer_action.triggered.connect(self.toggle_explorer_panel)
@@ -260,8 +278,18 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Ready")
         self.zoom_label = QLabel("Zoom: 100%")
         self.image_info_label = QLabel("")
+        self.history_label = QLabel("")
+        
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 2)
+        self.load_progress.setTextVisible(False)
+        self.load_progress.setFixedWidth(120)
+        self.load_progress.setMaximumHeight(12)
+        self.load_progress.hide()
         
         self.status_bar.addWidget(self.status_label)
+        self.status_bar.addWidget(self.load_progress)
+        self.status_bar.addPermanentWidget(self.history_label)
         self.status_bar.addPermanentWidget(self.image_info_label)
         self.status_bar.addPermanentWidget(self.zoom_label)
     
@@ -272,9 +300,14 @@ class MainWindow(QMainWindow):
         self.explorer.file_selected.connect(self.load_image_file)
         self.explorer.open_image.connect(self.load_image_file)
         self.viewer.zoom_changed.connect(self._update_zoom_display)
+        self.image_loader.preview_ready.connect(self._on_image_preview_ready)
+        self.image_loader.image_ready.connect(self._on_image_loaded)
+        self.image_loader.load_failed.connect(self._on_image_load_failed)
         self.editor.set_state_change_callback(self._on_editor_state_changed)
         self.editor_panel.crop_panel.crop_mode_toggled.connect(self.viewer.enable_crop_mode)
         self.editor_panel.crop_panel.crop_applied.connect(self._apply_crop)
+        self.editor_panel.preview_changed.connect(self._show_adjustment_preview)
+        self.editor_panel.preview_cancelled.connect(self._schedule_render)
         
         self.explorer.explorer.recent_files_updated.connect(lambda: self.update_recent_files_menu())
         
@@ -282,6 +315,8 @@ class MainWindow(QMainWindow):
             self.editor_panel.overlay_panel.grid_toggled.connect(self.viewer.toggle_grid_overlay)
             self.editor_panel.overlay_panel.ruler_toggled.connect(self.viewer.toggle_ruler_overlay)
             self.editor_panel.overlay_panel.pixel_info_toggled.connect(self.viewer.toggle_pixel_info_mode)
+            self.editor_panel.overlay_panel.pixel_sample_size_changed.connect(self.viewer.set_pixel_sample_size)
+            self.editor_panel.overlay_panel.pixel_histogram_toggled.connect(self.viewer.set_pixel_histogram_visible)
             self.editor_panel.overlay_panel.text_overlay_requested.connect(self.viewer.add_text_overlay)
             self.editor_panel.overlay_panel.shape_mode_changed.connect(self._on_shape_mode_changed)
             self.editor_panel.overlay_panel.overlays_cleared.connect(self.viewer.clear_overlays)
@@ -296,21 +331,87 @@ class MainWindow(QMainWindow):
             self.load_image_file(file_path)
     
     def load_image_file(self, file_path: str):
+        self.image_loader.load(file_path)
+        self.status_label.setText(f"Loading: {os.path.basename(file_path)}")
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+    
+    def _on_image_preview_ready(self, generation: int, file_path: str, preview, full_size):
+        if not self.image_loader.is_current(generation):
+            return
+        
+        self.viewer.show_preview(preview, full_size)
+        self.load_progress.setValue(1)
+    
+    def _on_image_loaded(self, generation: int, file_path: str, image: PhotonImage):
+        if not self.image_loader.is_current(generation):
+            return
+        
+        self.load_progress.setValue(2)
+        self.load_progress.hide()
         try:
-            if self.editor.load_image_from_file(file_path):
-                self.current_file_path = file_path
-                self.viewer.set_image(self.editor.current_image)
-                self.editor_panel.reset_controls()
-                self._update_window_title()
-                self._update_image_info()
-                self.status_label.setText(f"Loaded: {os.path.basename(file_path)}")
-                
-                self.explorer.explorer.add_recent_file(file_path)
-            else:
-                QMessageBox.warning(self, "Error", "Failed to load image")
+            self.editor.load_image(image)
+            self.current_file_path = file_path
+            self.editor_panel.reset_controls()
+            self._update_window_title()
+            self._update_image_info()
+            self.status_label.setText(f"Loaded: {os.path.basename(file_path)}")
+            
+            self.explorer.explorer.add_recent_file(file_path)
+            self._prefetch_neighbours(file_path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error loading image: {str(e)}")
     
+    def next_image(self):
+        self._step_image(1)
+    
+    def previous_image(self):
+        self._step_image(-1)
+    
+    def _step_image(self, offset: int):
+        if not self.current_file_path:
+            return
+        
+        images = self._sibling_images(self.current_file_path)
+        name = os.path.basename(self.current_file_path)
+        if name not in images:
+            return
+        
+        index = images.index(name) + offset
+        if 0 <= index < len(images):
+            self.step_direction = offset
+            file_path = os.path.join(os.path.dirname(self.current_file_path), images[index])
+            self.explorer.select_file(file_path)
+            self.load_image_file(file_path)
+    
+    def _sibling_images(self, file_path: str) -> list:
+        return self.explorer.explorer.list_directory(os.path.dirname(os.path.abspath(file_path))).image_files()
+    
+    # Decodes the images on either side of the current one in explorer order, nearest first and leaning
+    # towards the direction the user is stepping, so next/previous is served from memory.
+    def _prefetch_neighbours(self, file_path: str):
+        images = self._sibling_images(file_path)
+        name = os.path.basename(file_path)
+        if name not in images:
+            return
+        
+        index = images.index(name)
+        directory = os.path.dirname(os.path.abspath(file_path))
+        neighbours = []
+        for distance in range(1, self.prefetch_radius + 1):
+            for offset in (distance * self.step_direction, -distance * self.step_direction):
+                if 0 <= index + offset < len(images):
+                    neighbours.append(os.path.join(directory, images[index + offset]))
+        self.prefetcher.prefetch(neighbours)
+    
+    def _on_image_load_failed(self, generation: int, file_path: str, message: str):
+        if not self.image_loader.is_current(generation):
+            return
+        
+        self.load_progress.hide()
+        self.status_label.setText(f"Failed to load: {os.path.basename(file_path)}")
+        QMessageBox.warning(self, "Error", f"Failed to load image: {message}")
+    
 
     def cli_load_file(self, ipc_msg_data:dict[str, str]):
         self.load_file(ipc_msg_data["msg_data"])
@@ -348,18 +449,22 @@ class MainWindow(QMainWindow):
     
     def undo(self):
         if self.editor.undo():
-            self.viewer.set_image(self.editor.current_image)
-            self.status_label.setText("Undone")
+            self.status_label.setText(f"Undone{self._history_latency_text()}")
     
     def redo(self):
         if self.editor.redo():
-            self.viewer.set_image(self.editor.current_image)
-            self.status_label.setText("Redone")
+            self.status_label.setText(f"Redone{self._history_latency_text()}")
+    
+    def _history_latency_text(self) -> str:
+        last = self.editor.state.latency.last
+        if not last:
+            return ""
+        kind, _, seconds = last
+        return f" {kind} in {seconds * 1000:.1f} ms"
     
     def reset_image(self):
         if self.editor.current_image:
             self.editor.reset_to_original()
-            self.viewer.set_image(self.editor.current_image)
             self.editor_panel.reset_controls()
             self.status_label.setText("Reset to original")
     
@@ -370,10 +475,13 @@ class MainWindow(QMainWindow):
                   crop_rect.x() + crop_rect.width(), 
                   crop_rect.y() + crop_rect.height())
             self.editor.crop(box)
-            self.viewer.set_image(self.editor.current_image)
             self.viewer.enable_crop_mode(False)
             self.editor_panel.crop_panel.crop_mode_checkbox.setChecked(False)
     
+    def _show_adjustment_preview(self, preview_image):
+        if self.editor.current_image:
+            self.viewer.show_preview(preview_image, self.editor.current_image.size)
+    
     def _on_shape_mode_changed(self, shape_type: str):
         if shape_type:
             self.viewer.set_shape_drawing_mode(shape_type)
@@ -413,11 +521,30 @@ class MainWindow(QMainWindow):
         self.reset_action.setEnabled(has_image)
         self.undo_action.setEnabled(can_undo)
         self.redo_action.setEnabled(can_redo)
+        self._update_history_info()
+        self.editor_panel.sync_adjustments()
         
         if self.editor.current_image:
-            self.viewer.set_image(self.editor.current_image)
+            self._schedule_render()
             self._update_image_info()
     
+    def _update_history_info(self):
+        steps = len(self.editor.state.history)
+        if not steps:
+            self.history_label.setText("")
+            return
+        
+        text = f"History: {steps} steps, {get_file_size_str(self.editor.get_history_memory_size())}"
+        spilled = self.editor.get_history_spill_size()
+        if spilled:
+            text += f" ({get_file_size_str(spilled)} on disk)"
+        self.history_label.setText(text)
+    
+    # Several callers can report the same edit in one event-loop turn; the viewer coalesces them into one render.
+    def _schedule_render(self):
+        if self.editor.current_image:
+            self.viewer.schedule_render(self.editor.current_image, self.editor.generation)
+    
     def update_recent_files_menu(self):
         actions = self.recent_files_menu.actions()
         
@@ -477,6 +604,14 @@ class MainWindow(QMainWindow):
         self.explorer.explorer.clear_recent_files()
         self.update_recent_files_menu()
 
+    # Background pools would otherwise keep decoding, and hold the process open, after the window is gone.
+    def closeEvent(self, event):
+        self.image_loader.shutdown()
+        self.prefetcher.shutdown()
+        self.explorer.shutdown()
+        self.viewer.shutdown()
+        super().closeEvent(event)
+    
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Space:
             self.viewer.zoom_to_fit()
@@ -9,6 +9,8 @@ class OverlayPanel(QGroupBox):
     grid_toggled = Signal()
     ruler_toggled = Signal()
     pixel_info_toggled = Signal()
+    pixel_sample_size_changed = Signal(int)
+    pixel_histogram_toggled = Signal(bool)
     text_overlay_requested = Signal(str, str, int, QColor, bool)  # text, position, font_size, color, show_background
     shape_mode_changed = Signal(str)
     overlays_cleared = Signal()
@@ -69,6 +71,20 @@ class OverlayPanel(QGroupBox):
         layout.addWidget(self.ruler_checkbox)
         layout.addWidget(self.pixel_info_checkbox)
         
+        sample_layout = QHBoxLayout()
+        sample_layout.addWidget(QLabel("Sample:"))
+        self.sample_size_combo = QComboBox()
+        for size in (1, 3, 5, 9):
+            self.sample_size_combo.addItem(f"{size}x{size}", size)
+        self.sample_size_combo.setStyleSheet(self._combo_style())
+        sample_layout.addWidget(self.sample_size_combo)
+        
+        self.histogram_checkbox = QCheckBox("Histogram")
+        self.histogram_checkbox.setStyleSheet(self._checkbox_style())
+        sample_layout.addWidget(self.histogram_checkbox)
+        
+        layout.addLayout(sample_layout)
+        
         group.setLayout(layout)
         return group
     
@@ -206,6 +222,9 @@ class OverlayPanel(QGroupBox):
         self.grid_checkbox.toggled.connect(lambda: self.grid_toggled.emit())
         self.ruler_checkbox.toggled.connect(lambda: self.ruler_toggled.emit())
         self.pixel_info_checkbox.toggled.connect(lambda: self.pixel_info_toggled.emit())
+        self.sample_size_combo.currentIndexChanged.connect(
+            lambda: self.pixel_sample_size_changed.emit(self.sample_size_combo.currentData()))
+        self.histogram_checkbox.toggled.connect(self.pixel_histogram_toggled.emit)
         
         self.rectangle_btn.toggled.connect(lambda checked: self._on_shape_toggled("rectangle", checked))
         self.circle_btn.toggled.connect(lambda checked: self._on_shape_toggled("circle", checked))
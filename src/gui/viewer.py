@@ -1,17 +1,163 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QScrollArea, QPushButton, QFrame, QSizePolicy)
-from PySide6.QtCore import Qt, Signal, QTimer, QRect, QPoint
-from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QWheelEvent, QMouseEvent
-from core.utils import pil_to_qpixmap, scale_pixmap_smooth
+from PySide6.QtCore import Qt, Signal, QTimer, QRect, QPoint, QSize
+from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QWheelEvent, QMouseEvent, QRegion
+from core.qt.convert import pil_to_display_qimage, pil_to_qpixmap, qpixmap_to_pil
+from core.sampling import PixelSampler
 from core.image import PhotonImage
-from core.overlays import (OverlayManager, GridOverlay, RulerOverlay, TextOverlay, 
-                            CrosshairOverlay, ShapeOverlay, PixelInfoOverlay)
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image as PILImage
+from core.qt.overlays import (OverlayManager, GridOverlay, RulerOverlay, TextOverlay, 
+                               CrosshairOverlay, ShapeOverlay, PixelInfoOverlay)
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
 import math
 
 
+def build_pyramid(image: PILImage.Image, min_size: int) -> List[PILImage.Image]:
+    if image.mode not in ('L', 'LA', 'RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.getbands() else 'RGB')
+    
+    levels = []
+    while max(image.size) > min_size:
+        image = image.reduce(2)
+        levels.append(image)
+    return levels
+
+
+class ImageCanvas(QWidget):
+    TILE_SIZE = 256
+    
+    def __init__(self):
+        super().__init__()
+        self.source: Optional[QPixmap] = None
+        self.levels: List[QPixmap] = []
+        self.image_size = QSize()
+        self.scale = 1.0
+        self.smooth = True
+        self.tiles: OrderedDict = OrderedDict()
+        self.max_tiles = 64
+        self.paint_overlays: Optional[Callable[[QPainter, QRect], None]] = None
+        self.setMinimumSize(100, 100)
+    
+    def set_source(self, pixmap: QPixmap, image_size: Optional[Tuple[int, int]] = None):
+        # The source may be a reduced preview of a larger image; tiles are mapped onto image_size.
+        self.source = pixmap
+        self.levels = [pixmap]
+        self.image_size = QSize(*image_size) if image_size else pixmap.size()
+        self.tiles.clear()
+        self._update_geometry()
+    
+    def set_levels(self, levels: List[QPixmap]):
+        self.levels = [self.source] + levels
+        self.update()
+    
+    def set_smooth(self, smooth: bool):
+        if smooth != self.smooth:
+            self.smooth = smooth
+            self.update()
+    
+    def set_scale(self, scale: float):
+        if scale != self.scale:
+            self.scale = scale
+            self._update_geometry()
+    
+    def set_tile_budget(self, viewport_size: QSize):
+        columns = viewport_size.width() // self.TILE_SIZE + 2
+        rows = viewport_size.height() // self.TILE_SIZE + 2
+        self.max_tiles = columns * rows * 2
+        self._evict_tiles()
+    
+    def display_size(self) -> QSize:
+        return QSize(max(1, round(self.image_size.width() * self.scale)),
+                     max(1, round(self.image_size.height() * self.scale)))
+    
+    def image_rect(self) -> QRect:
+        if not self.source:
+            return QRect()
+        
+        size = self.display_size()
+        x = max(0, (self.width() - size.width()) // 2)
+        y = max(0, (self.height() - size.height()) // 2)
+        return QRect(x, y, size.width(), size.height())
+    
+    def paintEvent(self, event):
+        if not self.source:
+            return
+        
+        painter = QPainter(self)
+        image_rect = self.image_rect()
+        exposed = event.rect().intersected(image_rect)
+        if not exposed.isEmpty():
+            self._draw_tiles(painter, image_rect, exposed)
+        
+        if self.paint_overlays:
+            self.paint_overlays(painter, image_rect)
+        painter.end()
+    
+    def _update_geometry(self):
+        if self.source:
+            self.setMinimumSize(self.display_size())
+        self.update()
+    
+    def _draw_tiles(self, painter: QPainter, image_rect: QRect, exposed: QRect):
+        display_size = self.display_size()
+        
+        # Sample from the smallest pyramid level that still has at least one pixel per display pixel.
+        level = 0
+        while level + 1 < len(self.levels) and self.levels[level + 1].width() >= display_size.width():
+            level += 1
+        source = self.levels[level]
+        source_width, source_height = source.width(), source.height()
+        
+        # Tiles are cut on a grid in source pixels so neighbouring tiles meet on whole display pixels.
+        tile_scale = display_size.width() / source_width
+        step = max(1, round(self.TILE_SIZE / tile_scale))
+        span = step * tile_scale
+        
+        left = exposed.left() - image_rect.left()
+        top = exposed.top() - image_rect.top()
+        first_column, last_column = int(left // span), min(int((left + exposed.width() - 1) // span), (source_width - 1) // step)
+        first_row, last_row = int(top // span), min(int((top + exposed.height() - 1) // span), (source_height - 1) // step)
+        
+        for row in range(first_row, last_row + 1):
+            y0, y1 = self._tile_span(row, step, tile_scale, source_height, display_size.height())
+            for column in range(first_column, last_column + 1):
+                x0, x1 = self._tile_span(column, step, tile_scale, source_width, display_size.width())
+                target = QRect(x0, y0, x1 - x0, y1 - y0)
+                tile = self._get_tile(level, column, row, step, target.size())
+                painter.drawPixmap(target.translated(image_rect.topLeft()), tile)
+    
+    def _tile_span(self, index: int, step: int, tile_scale: float, source_limit: int, display_limit: int) -> Tuple[int, int]:
+        start = round(index * step * tile_scale)
+        if (index + 1) * step >= source_limit:
+            return start, display_limit
+        return start, round((index + 1) * step * tile_scale)
+    
+    def _get_tile(self, level: int, column: int, row: int, step: int, size: QSize) -> QPixmap:
+        key = (self.scale, level, self.smooth, column, row)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        
+        source = self.levels[level]
+        source_rect = QRect(column * step, row * step, step, step).intersected(source.rect())
+        transform = Qt.SmoothTransformation if self.smooth else Qt.FastTransformation
+        tile = source.copy(source_rect).scaled(size, Qt.IgnoreAspectRatio, transform)
+        self.tiles[key] = tile
+        self._evict_tiles()
+        return tile
+    
+    def _evict_tiles(self):
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+
+
 class ImageViewer(QScrollArea):
     image_clicked = Signal(int, int)
     zoom_changed = Signal(float)
+    pyramid_ready = Signal(int, object)
     
     def __init__(self):
         super().__init__()
@@ -24,14 +170,26 @@ class ImageViewer(QScrollArea):
             }
         """)
         
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setStyleSheet("background-color: transparent;")
-        self.image_label.setMinimumSize(100, 100)
+        self.canvas = ImageCanvas()
+        self.canvas.setStyleSheet("background-color: transparent;")
+        self.canvas.paint_overlays = self._paint_overlays
+        
+        self.setWidget(self.canvas)
         
-        self.setWidget(self.image_label)
+        self.pyramid_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyramid')
+        self.pyramid_generation = 0
+        self.pyramid_ready.connect(self._on_pyramid_ready)
+        
+        self.quality_timer = QTimer(self)
+        self.quality_timer.setSingleShot(True)
+        self.quality_timer.setInterval(200)
+        self.quality_timer.timeout.connect(lambda: self.canvas.set_smooth(True))
+        
+        self.pending_render: Optional[Tuple[PhotonImage, int]] = None
+        self.rendered_key: Optional[Tuple[int, int]] = None
+        self.render_count = 0
+        self.skipped_renders = 0
         
-        self.current_pixmap = None
         self.original_pixmap = None
         self.zoom_factor = 1.0
         self.fit_to_window = True
@@ -43,32 +201,107 @@ class ImageViewer(QScrollArea):
         self.overlay_manager = OverlayManager()
         self.show_overlays = True
         self.pixel_info_mode = False
+        self.pixel_sample_size = 1
+        self.show_pixel_histogram = False
+        self.histogram_sample_size = 32
+        self.sample_source: Optional[PILImage.Image] = None
+        self.sample_scale = (1.0, 1.0)
+        self.pixel_sampler: Optional[PixelSampler] = None
         self.shape_drawing_mode = None
         self.current_shape = None
         self.mouse_position = QPoint()
         
-        self.image_label.mousePressEvent = self._mouse_press_event
-        self.image_label.mouseMoveEvent = self._mouse_move_event
-        self.image_label.mouseReleaseEvent = self._mouse_release_event
+        self.canvas.mousePressEvent = self._mouse_press_event
+        self.canvas.mouseMoveEvent = self._mouse_move_event
+        self.canvas.mouseReleaseEvent = self._mouse_release_event
     
     def set_image(self, photon_image: PhotonImage):
         if photon_image:
-            self.original_pixmap = pil_to_qpixmap(photon_image.current)
-            self._update_display()
+            self.set_pixmap(pil_to_qpixmap(photon_image.current))
+            self.sample_source = photon_image.current
+            self.pyramid_executor.submit(self._build_pyramid, self.pyramid_generation, photon_image.current)
+    
+    def schedule_render(self, photon_image: PhotonImage, generation: int):
+        if self.pending_render is not None:
+            self.skipped_renders += 1
+        else:
+            QTimer.singleShot(0, self._flush_render)
+        self.pending_render = (photon_image, generation)
+    
+    def _flush_render(self):
+        if self.pending_render is None:
+            return
+        
+        photon_image, generation = self.pending_render
+        self.pending_render = None
+        key = (id(photon_image), generation)
+        if key == self.rendered_key:
+            self.skipped_renders += 1
+            return
+        
+        self.set_image(photon_image)
+        self.rendered_key = key
+        self.render_count += 1
+    
+    def show_preview(self, pil_image, full_size):
+        self.rendered_key = None
+        self.pyramid_generation += 1
+        self.canvas.set_source(pil_to_qpixmap(pil_image), full_size)
+        # Pixel info reads the preview while it is shown, mapping full-size coordinates onto the reduced proxy.
+        self.sample_source = pil_image
+        self.sample_scale = (pil_image.width / full_size[0], pil_image.height / full_size[1])
+        self.pixel_sampler = None
+        self._update_display()
+        if self.pixel_info_mode:
+            self._update_pixel_info(self.mouse_position)
     
     def set_pixmap(self, pixmap: QPixmap):
+        self.rendered_key = None
+        self.pyramid_generation += 1
         self.original_pixmap = pixmap
+        self.sample_source = None
+        self.sample_scale = (1.0, 1.0)
+        self.pixel_sampler = None
+        self.canvas.set_source(pixmap)
         self._update_display()
     
+    def _build_pyramid(self, generation: int, image: PILImage.Image):
+        if generation != self.pyramid_generation:
+            return
+        try:
+            levels = [pil_to_display_qimage(level) for level in build_pyramid(image, ImageCanvas.TILE_SIZE)]
+        except Exception as e:
+            print(f"Failed to build image pyramid: {e}")
+            return
+        self.pyramid_ready.emit(generation, levels)
+    
+    def _on_pyramid_ready(self, generation: int, levels: list):
+        if generation == self.pyramid_generation:
+            self.canvas.set_levels([QPixmap.fromImage(level) for level in levels])
+    
+    def shutdown(self):
+        self.pyramid_generation += 1
+        self.pyramid_executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _begin_interactive_zoom(self):
+        self.canvas.set_smooth(False)
+        self.quality_timer.start()
+    
     def zoom_in(self):
+        if self.fit_to_window and self.canvas.source:
+            self.zoom_factor = self.canvas.scale
         self.fit_to_window = False
         self.zoom_factor *= 1.25
+        self._begin_interactive_zoom()
         self._update_display()
         self.zoom_changed.emit(self.zoom_factor)
     
     def zoom_out(self):
+        if self.fit_to_window and self.canvas.source:
+            self.zoom_factor = self.canvas.scale
         self.fit_to_window = False
         self.zoom_factor /= 1.25
+        self._begin_interactive_zoom()
         self._update_display()
         self.zoom_changed.emit(self.zoom_factor)
     
@@ -92,7 +325,7 @@ class ImageViewer(QScrollArea):
         self.crop_mode = enabled
         if not enabled:
             self.crop_rect = None
-            self._update_display()
+            self._update_overlays()
     
     def set_shape_drawing_mode(self, shape_type: str):
         self.shape_drawing_mode = shape_type
@@ -106,7 +339,7 @@ class ImageViewer(QScrollArea):
         else:
             grid = GridOverlay()
             self.overlay_manager.add_overlay(grid)
-        self._update_display()
+        self._update_overlays()
     
     def toggle_ruler_overlay(self):
         ruler_overlays = self.overlay_manager.get_overlays_by_type(RulerOverlay)
@@ -116,10 +349,10 @@ class ImageViewer(QScrollArea):
         else:
             ruler = RulerOverlay()
             self.overlay_manager.add_overlay(ruler)
-        self._update_display()
+        self._update_overlays()
     
     def add_text_overlay(self, text: str, position_str: str = "Click to Place", font_size: int = 16, color: QColor | None = None, show_background: bool = True):
-        from core.overlays import AnchorPosition
+        from core.qt.overlays import AnchorPosition
         
         if color is None:
             color = QColor(255, 255, 255)
@@ -146,22 +379,43 @@ class ImageViewer(QScrollArea):
         text_overlay.set_anchor_position(anchor)
         
         self.overlay_manager.add_overlay(text_overlay)
-        self._update_display()
+        self._update_overlays()
     
     def toggle_pixel_info_mode(self):
         self.pixel_info_mode = not self.pixel_info_mode
+        self.canvas.setMouseTracking(self.pixel_info_mode)
         if not self.pixel_info_mode:
             pixel_overlays = self.overlay_manager.get_overlays_by_type(PixelInfoOverlay)
             for overlay in pixel_overlays:
                 self.overlay_manager.remove_overlay(overlay)
-        self._update_display()
+        self._update_overlays()
+    
+    def set_pixel_sample_size(self, size: int):
+        self.pixel_sample_size = max(1, size)
+        if self.pixel_info_mode:
+            self._update_pixel_info(self.mouse_position)
+    
+    def set_pixel_histogram_visible(self, visible: bool):
+        self.show_pixel_histogram = visible
+        if self.pixel_info_mode:
+            self._update_pixel_info(self.mouse_position)
     
     def clear_overlays(self):
         self.overlay_manager.clear_overlays()
-        self._update_display()
+        self._update_overlays()
     
     def get_crop_rect(self):
-        return self.crop_rect
+        if not self.crop_rect:
+            return None
+        
+        image_rect = self._get_image_rect()
+        rect = self.crop_rect.intersected(image_rect).translated(-image_rect.topLeft())
+        if rect.isEmpty():
+            return None
+        
+        scale = self.canvas.scale
+        return QRect(int(rect.x() / scale), int(rect.y() / scale),
+                     max(1, round(rect.width() / scale)), max(1, round(rect.height() / scale)))
     
     def wheelEvent(self, event: QWheelEvent):
         if event.modifiers() == Qt.ControlModifier:
@@ -187,12 +441,14 @@ class ImageViewer(QScrollArea):
         self.mouse_position = event.pos()
         
         if self.crop_mode and self.crop_start:
+            previous_rect = self._get_active_crop_rect()
             self.crop_end = event.pos()
-            self._update_crop_display()
+            self._update_crop_display(previous_rect)
         elif self.shape_drawing_mode and self.current_shape:
+            previous_rect = self._get_overlay_damage(self.current_shape)
             end_pos = self._screen_to_image_pos(event.pos())
             self.current_shape.set_points(self.current_shape.start_point, end_pos)
-            self._update_display()
+            self._update_overlays(previous_rect.united(self._get_overlay_damage(self.current_shape)))
         elif self.pixel_info_mode and self.original_pixmap:
             self._update_pixel_info(event.pos())
     
@@ -204,99 +460,127 @@ class ImageViewer(QScrollArea):
             if abs(x2 - x1) > 5 and abs(y2 - y1) > 5:
                 self.crop_rect = QRect(min(x1, x2), min(y1, y2), 
                                        abs(x2 - x1), abs(y2 - y1))
-                self._update_display()
+            self.crop_start = None
+            self.crop_end = None
+            self._update_overlays()
         elif self.shape_drawing_mode and self.current_shape:
             self.current_shape = None
             self.shape_drawing_mode = None
     
     def _screen_to_image_pos(self, screen_pos: QPoint) -> QPoint:
-        if not self.current_pixmap:
+        if not self.canvas.source:
             return QPoint(0, 0)
         
         image_rect = self._get_image_rect()
         if image_rect.contains(screen_pos):
-            rel_x = (screen_pos.x() - image_rect.left()) / self.zoom_factor
-            rel_y = (screen_pos.y() - image_rect.top()) / self.zoom_factor
+            rel_x = (screen_pos.x() - image_rect.left()) / self.canvas.scale
+            rel_y = (screen_pos.y() - image_rect.top()) / self.canvas.scale
             return QPoint(int(rel_x), int(rel_y))
         return QPoint(0, 0)
     
     def _get_image_rect(self) -> QRect:
-        if not self.current_pixmap:
-            return QRect()
-        
-        label_rect = self.image_label.geometry()
-        pixmap_size = self.current_pixmap.size()
-        
-        x = label_rect.x() + (label_rect.width() - pixmap_size.width()) // 2
-        y = label_rect.y() + (label_rect.height() - pixmap_size.height()) // 2
-        
-        return QRect(x, y, pixmap_size.width(), pixmap_size.height())
+        return self.canvas.image_rect()
     
     def _update_pixel_info(self, screen_pos: QPoint):
+        sampler = self._get_pixel_sampler()
         image_pos = self._screen_to_image_pos(screen_pos)
+        x, y = int(image_pos.x() * self.sample_scale[0]), int(image_pos.y() * self.sample_scale[1])
+        if not sampler or not sampler.contains(x, y):
+            return
+        
+        pixel_color = QColor(*sampler.sample_average(x, y, self.pixel_sample_size))
+        histogram = None
+        if self.show_pixel_histogram:
+            histogram = sampler.histogram(x, y, self.histogram_sample_size)
         
-        if self.original_pixmap and not self.original_pixmap.isNull():
-            if (0 <= image_pos.x() < self.original_pixmap.width() and 
-                0 <= image_pos.y() < self.original_pixmap.height()):
-                
-                pixel_color = self.original_pixmap.toImage().pixelColor(image_pos.x(), image_pos.y())
-                
-                pixel_overlays = self.overlay_manager.get_overlays_by_type(PixelInfoOverlay)
-                for overlay in pixel_overlays:
-                    self.overlay_manager.remove_overlay(overlay)
-                
-                pixel_info = PixelInfoOverlay(image_pos, pixel_color)
-                self.overlay_manager.add_overlay(pixel_info)
-                self._update_display()
+        pixel_overlays = self.overlay_manager.get_overlays_by_type(PixelInfoOverlay)
+        if pixel_overlays:
+            pixel_info = pixel_overlays[0]
+            damaged_rect = self._get_overlay_damage(pixel_info)
+            pixel_info.update_info(image_pos, pixel_color, histogram)
+        else:
+            damaged_rect = QRect()
+            pixel_info = PixelInfoOverlay(image_pos, pixel_color, histogram)
+            self.overlay_manager.add_overlay(pixel_info)
+        self._update_overlays(damaged_rect.united(self._get_overlay_damage(pixel_info)))
+    
+    def _get_pixel_sampler(self) -> Optional[PixelSampler]:
+        # Built once per displayed image; mouse moves only index into the already decoded buffer.
+        if self.pixel_sampler is None:
+            if self.sample_source is not None:
+                self.pixel_sampler = PixelSampler(self.sample_source)
+            elif self.original_pixmap and not self.original_pixmap.isNull():
+                self.pixel_sampler = PixelSampler(qpixmap_to_pil(self.original_pixmap))
+        return self.pixel_sampler
     
     def _update_display(self):
-        if not self.original_pixmap:
+        if not self.canvas.source:
             return
         
-        if self.fit_to_window:
-            viewport_size = self.viewport().size()
-            self.current_pixmap = scale_pixmap_smooth(
-                self.original_pixmap, viewport_size, True)
-        else:
-            new_size = self.original_pixmap.size() * self.zoom_factor
-            self.current_pixmap = scale_pixmap_smooth(
-                self.original_pixmap, new_size, False)
-        
-        display_pixmap = QPixmap(self.current_pixmap)
-        painter = QPainter(display_pixmap)
+        self.canvas.set_scale(self._get_display_scale())
+        self.canvas.update()
+    
+    def _get_display_scale(self) -> float:
+        if not self.fit_to_window:
+            return self.zoom_factor
         
-        if self.crop_mode and self.crop_rect:
-            self._draw_crop_overlay(painter)
+        image_size = self.canvas.image_size
+        viewport_size = self.viewport().size()
+        return min(viewport_size.width() / image_size.width(), viewport_size.height() / image_size.height())
+    
+    def _paint_overlays(self, painter: QPainter, image_rect: QRect):
+        if self.crop_mode:
+            self._draw_crop_overlay(painter, image_rect)
         
         if self.show_overlays:
-            image_rect = QRect(0, 0, display_pixmap.width(), display_pixmap.height())
-            actual_zoom = self.current_pixmap.width() / self.original_pixmap.width()
-            self.overlay_manager.draw_all(painter, image_rect, actual_zoom)
-        
-        painter.end()
-        
-        self.image_label.setPixmap(display_pixmap)
-        self.image_label.resize(display_pixmap.size())
+            painter.save()
+            painter.translate(image_rect.topLeft())
+            self.overlay_manager.draw_all(painter, QRect(0, 0, image_rect.width(), image_rect.height()), self.canvas.scale)
+            painter.restore()
     
-    def _update_crop_display(self):
-        self._update_display()
+    def _update_overlays(self, damaged_rect: Optional[QRect] = None):
+        # Tiles are cached, so repainting the damaged area only blits them and redraws the overlays.
+        if damaged_rect is None:
+            self.canvas.update()
+        elif not damaged_rect.isEmpty():
+            self.canvas.update(damaged_rect)
     
-    def _draw_crop_overlay(self, painter: QPainter):
-        if not self.crop_rect:
+    def _get_overlay_damage(self, overlay) -> QRect:
+        image_rect = self._get_image_rect()
+        local_rect = QRect(0, 0, image_rect.width(), image_rect.height())
+        bounds = overlay.bounding_rect(local_rect, self.canvas.scale)
+        return bounds.translated(image_rect.topLeft()).adjusted(-2, -2, 2, 2)
+    
+    def _update_crop_display(self, previous_rect: Optional[QRect] = None):
+        current_rect = self._get_active_crop_rect()
+        if previous_rect is None or current_rect is None:
+            self._update_overlays()
+            return
+        self._update_overlays(previous_rect.united(current_rect).adjusted(-3, -3, 3, 3))
+    
+    def _get_active_crop_rect(self) -> Optional[QRect]:
+        if self.crop_start and self.crop_end:
+            return QRect(self.crop_start, self.crop_end).normalized()
+        return self.crop_rect
+    
+    def _draw_crop_overlay(self, painter: QPainter, image_rect: QRect):
+        crop_rect = self._get_active_crop_rect()
+        if not crop_rect:
             return
         
-        overlay_color = QColor(0, 0, 0, 128)
-        painter.fillRect(painter.device().rect(), overlay_color)
-        
-        painter.setCompositionMode(QPainter.CompositionMode_Clear)
-        painter.fillRect(self.crop_rect, Qt.transparent)
+        painter.save()
+        painter.setClipRegion(QRegion(image_rect).subtracted(QRegion(crop_rect)))
+        painter.fillRect(image_rect, QColor(0, 0, 0, 128))
+        painter.restore()
         
-        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
         pen = QPen(QColor(255, 255, 255), 2, Qt.DashLine)
         painter.setPen(pen)
-        painter.drawRect(self.crop_rect)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(crop_rect)
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        self.canvas.set_tile_budget(self.viewport().size())
         if self.fit_to_window:
+            self._begin_interactive_zoom()
             QTimer.singleShot(50, self._update_display)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import os
+import sys
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image as PILImage
+from core.prefetch import ImagePrefetcher
+
+
+class ImmediateExecutor:
+    # Runs work inside submit(), so every future is already finished when the prefetcher attaches its callback.
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+class IdleExecutor:
+    # Never starts work, so every future stays queued until it is cancelled.
+    def __init__(self):
+        self.futures = []
+    
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        self.futures.append(future)
+        return future
+    
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+@pytest.fixture
+def image_paths(tmp_path) -> list:
+    paths = []
+    for index in range(3):
+        path = str(tmp_path / f"image-{index}.png")
+        PILImage.new('RGB', (32, 24), (index * 80, 40, 200)).save(path)
+        paths.append(path)
+    return paths
+
+
+def run_with_timeout(function, *args):
+    worker = threading.Thread(target=function, args=args, daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive(), "prefetcher deadlocked"
+
+
+def test_prefetch_when_decode_finishes_before_callback(image_paths):
+    prefetcher = ImagePrefetcher()
+    prefetcher.executor.shutdown()
+    prefetcher.executor = ImmediateExecutor()
+    
+    run_with_timeout(prefetcher.prefetch, image_paths)
+    
+    for path in image_paths:
+        assert prefetcher.pending(path) is None
+        assert prefetcher.get(path).size == (32, 24)
+
+
+def test_dropping_queued_work_does_not_deadlock(image_paths):
+    prefetcher = ImagePrefetcher()
+    prefetcher.executor.shutdown()
+    prefetcher.executor = IdleExecutor()
+    
+    run_with_timeout(prefetcher.prefetch, image_paths[:2])
+    run_with_timeout(prefetcher.prefetch, image_paths[2:])
+    
+    assert [future.cancelled() for future in prefetcher.executor.futures] == [True, True, False]
+    assert prefetcher.pending(image_paths[0]) is None
+    assert prefetcher.pending(image_paths[2]) is not None
+    
+    run_with_timeout(prefetcher.cancel_all)
+    assert prefetcher.pending(image_paths[2]) is None
@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PIL import Image as PILImage
+from core.image import PhotonImage
+from core.tiled import TiledImage
+
+
+SIZE = (320, 700)
+MODES = ('RGB', 'RGBA', 'L', 'LA', 'P')
+
+
+@pytest.fixture
+def source_path(tmp_path) -> str:
+    noise = PILImage.effect_noise(SIZE, 60)
+    gradient = PILImage.linear_gradient('L').resize(SIZE)
+    image = PILImage.merge('RGB', [noise, gradient, noise.transpose(PILImage.FLIP_LEFT_RIGHT)])
+    path = str(tmp_path / 'source.png')
+    image.save(path)
+    return path
+
+
+def convert_source(source_path: str, mode: str, directory) -> str:
+    image = PILImage.open(source_path)
+    if mode in ('RGBA', 'LA'):
+        alpha = image.getchannel('G').transpose(PILImage.FLIP_TOP_BOTTOM)
+        image = image.convert(mode[:-1])
+        image.putalpha(alpha)
+    elif mode == 'P':
+        image = image.convert('P', palette=PILImage.Palette.ADAPTIVE, colors=64)
+    else:
+        image = image.convert(mode)
+    path = str(directory / f"source-{mode}.png")
+    image.save(path)
+    return path
+
+
+def random_filters(rng: random.Random) -> list:
+    filters = []
+    for _ in range(rng.randint(2, 5)):
+        name = rng.choice(['brightness', 'contrast', 'invert', 'grayscale', 'sepia', 'resize', 'flip_vertical'])
+        if name in ('brightness', 'contrast'):
+            filters.append((name, round(rng.uniform(0.3, 1.8), 2)))
+        elif name == 'resize':
+            filters.append((name, ((rng.randint(20, 300), rng.randint(20, 650)), rng.random() < 0.5)))
+        else:
+            filters.append((name, None))
+    return filters
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_random_stacks_match_in_memory(source_path, tmp_path, monkeypatch, mode):
+    monkeypatch.setattr(TiledImage, 'BAND_HEIGHT', 64)
+    path = convert_source(source_path, mode, tmp_path)
+    rng = random.Random(mode)
+    
+    for _ in range(8):
+        filters = random_filters(rng)
+        expected = PhotonImage.from_file(path)
+        expected.apply_filters(filters)
+        
+        streamed = TiledImage.from_file(path, str(tmp_path))
+        try:
+            streamed.apply_filters(filters)
+            result = streamed.render()
+            assert (result.mode, result.size) == (expected.mode, expected.size), filters
+            assert result.tobytes() == expected.current.tobytes(), filters
+        finally:
+            streamed.close()
+
+
+@pytest.mark.parametrize('degrees', [0.0, 180.0, 360.0, -180.0, 540.0])
+def test_rotate_matches_in_memory(source_path, tmp_path, degrees):
+    expected = PhotonImage.from_file(source_path)
+    expected.rotate(degrees)
+    
+    streamed = TiledImage.from_file(source_path, str(tmp_path))
+    try:
+        streamed.rotate(degrees)
+        result = streamed.render()
+        assert result.size == expected.current.size
+        assert result.tobytes() == expected.current.tobytes()
+    finally:
+        streamed.close()
+
+
+def test_save_la_as_tiled_tiff(source_path, tmp_path):
+    path = str(tmp_path / 'gray.png')
+    gray = PILImage.open(source_path).convert('L')
+    PILImage.merge('LA', [gray, gray.transpose(PILImage.FLIP_TOP_BOTTOM)]).save(path)
+    
+    streamed = TiledImage.from_file(path, str(tmp_path))
+    try:
+        output = str(tmp_path / 'out.tif')
+        streamed.save(output, 'TIFF')
+        expected = streamed.render().copy()
+    finally:
+        streamed.close()
+    
+    with PILImage.open(output) as written:
+        assert written.mode == 'LA'
+        assert written.tobytes() == expected.tobytes()